@@ -4,8 +4,12 @@ Local development install script for ZelUtil.
 Run this from the cloned zelutil directory for local development.
 
 Usage:
-  python3 dev-install.py
+  python3 dev-install.py [--template]
+
+With --template a missing temp_venv is cloned from ../venv-template
+instead of being built from scratch.
 """
+import argparse
 import os
 import sys
 import subprocess
@@ -18,15 +22,39 @@ def get_dev_venv_path():
     return Path(__file__).parent.parent / "temp_venv"
 
 def main():
+    parser = argparse.ArgumentParser(description="Set up a development venv for zelutil")
+    parser.add_argument("--template", action="store_true",
+                        help="Clone a missing venv from the template venv instead of building it")
+    args = parser.parse_args()
+    
     # Ensure we're in the zelutil directory
-    if not (Path(__file__).parent / "src" / "zelutil").exists():
+    repo_dir = Path(__file__).parent
+    if not (repo_dir / "src" / "zelutil").exists():
         print("Error: Run this script from the zelutil repository root")
         sys.exit(1)
     
+    # Stdlib-only helper, loaded from the source tree before zelutil is installed
+    sys.path.insert(0, str(repo_dir / "src" / "zelutil" / "utils"))
+    import venv_template
+    
     venv_path = get_dev_venv_path()
+    cloned = args.template and not venv_path.exists() and venv_template.is_supported()
     
-    print(f"Creating development virtual environment at {venv_path}...")
-    subprocess.run([sys.executable, "-m", "venv", str(venv_path)], check=True)
+    if cloned:
+        def install(pip_exe, names):
+            result = subprocess.run([str(pip_exe), "install", "-e", str(repo_dir)])
+            return [] if result.returncode == 0 else names
+        
+        failed = venv_template.provision_venv(
+            venv_path, venv_template.get_template_path(repo_dir.parent),
+            {"zelutil": repo_dir}, install
+        )
+        if failed:
+            print("Error: Failed to install zelutil into the cloned venv")
+            sys.exit(1)
+    else:
+        print(f"Creating development virtual environment at {venv_path}...")
+        subprocess.run([sys.executable, "-m", "venv", str(venv_path)], check=True)
     
     # Get executables
     if platform.system() == "Windows":
@@ -38,8 +66,9 @@ def main():
         pip_exe = venv_path / "bin" / "pip"
         bin_path = venv_path / "bin"
     
-    print("Installing zelutil in development mode...")
-    subprocess.run([str(pip_exe), "install", "-e", "."], check=True)
+    if not cloned:
+        print("Installing zelutil in development mode...")
+        subprocess.run([str(pip_exe), "install", "-e", "."], check=True)
     
     # Store install location in paths.json
     if platform.system() == "Windows":
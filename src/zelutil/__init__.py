@@ -1,10 +1,38 @@
-from .utils.paths import get_path, set_path
-from .utils.state import resolve_state_dir
-from .utils.config import load_config, save_config
-from .utils.integration import get_installed_apps, get_app_data_dir
+import importlib
+
+# Public names and the module that provides them. They are imported on first
+# access so ``import zelutil.utils.state`` does not load the rest of the package.
+_EXPORTS = {
+    "get_path": ".utils.paths",
+    "get_paths": ".utils.paths",
+    "set_path": ".utils.paths",
+    "set_paths": ".utils.paths",
+    "resolve_state_dir": ".utils.state",
+    "state_transaction": ".utils.state",
+    "load_config": ".utils.config",
+    "save_config": ".utils.config",
+    "get_installed_apps": ".utils.integration",
+    "get_app_data_dir": ".utils.integration",
+    "AppStorage": ".utils.storage",
+    "iter_items": ".utils.stream",
+}
 
 __all__ = [
-    "get_path", "set_path", "resolve_state_dir",
-    "load_config", "save_config", 
-    "get_installed_apps", "get_app_data_dir"
+    "get_path", "get_paths", "set_path", "set_paths",
+    "resolve_state_dir", "state_transaction",
+    "load_config", "save_config",
+    "get_installed_apps", "get_app_data_dir",
+    "AppStorage", "iter_items",
 ]
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
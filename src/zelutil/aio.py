@@ -0,0 +1,350 @@
+"""asyncio equivalents of the zelutil API.
+
+Clones, fetches, merges and pip runs go through
+``asyncio.create_subprocess_exec``, while state files, and the bookkeeping
+that records them, run in worker threads through ``asyncio.to_thread``, so
+none of these calls block the event loop. Planning and bookkeeping are
+shared with the blocking modules; only the process handling lives here.
+Return values match the blocking functions they mirror.
+"""
+import asyncio
+import shutil
+import sys
+import time
+
+from .core import DEFAULT_JOBS, installer, updater, wheelhouse
+from .core.events import span
+from .core.mirrors import get_mirror_path, mirror_command
+from .core.registry import load_modules
+from .utils import build_plan, config, integration, paths, venv_template
+
+
+async def run(cmd, cwd=None, capture=True):
+    """Run a command without blocking the loop, returning (returncode, stdout, stderr)"""
+    pipe = asyncio.subprocess.PIPE if capture else None
+    proc = await asyncio.create_subprocess_exec(
+        *[str(part) for part in cmd], cwd=cwd, stdout=pipe, stderr=pipe
+    )
+    stdout, stderr = await proc.communicate()
+    return (
+        proc.returncode,
+        stdout.decode(errors="replace") if stdout else "",
+        stderr.decode(errors="replace") if stderr else "",
+    )
+
+
+async def _bounded(jobs, coros):
+    """Await coroutines with at most ``jobs`` running at once, keeping their order"""
+    semaphore = asyncio.Semaphore(max(1, jobs))
+
+    async def guarded(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(guarded(coro) for coro in coros))
+
+
+# State access
+
+async def get_path(key, cli_override=None, save_if_override=False, default=None):
+    """Async ``zelutil.utils.paths.get_path``"""
+    return await asyncio.to_thread(paths.get_path, key, cli_override, save_if_override, default)
+
+
+async def get_paths(keys, defaults=None):
+    """Async ``zelutil.utils.paths.get_paths``"""
+    return await asyncio.to_thread(paths.get_paths, keys, defaults)
+
+
+async def set_path(key, value):
+    """Async ``zelutil.utils.paths.set_path``"""
+    await asyncio.to_thread(paths.set_path, key, value)
+
+
+async def set_paths(values):
+    """Async ``zelutil.utils.paths.set_paths``"""
+    await asyncio.to_thread(paths.set_paths, values)
+
+
+async def load_config(app_name=None):
+    """Async ``zelutil.utils.config.load_config``"""
+    return await asyncio.to_thread(config.load_config, app_name)
+
+
+async def save_config(data, app_name=None):
+    """Async ``zelutil.utils.config.save_config``"""
+    await asyncio.to_thread(config.save_config, data, app_name)
+
+
+async def get_installed_apps(verify=False, installed_only=False):
+    """Async ``zelutil.utils.integration.get_installed_apps``"""
+    return await asyncio.to_thread(integration.get_installed_apps, verify, installed_only)
+
+
+# Module operations
+
+async def ensure_mirror(install_dir, module_name, repo_url):
+    """Async ``zelutil.core.mirrors.ensure_mirror``"""
+    cmd = await asyncio.to_thread(mirror_command, install_dir, module_name, repo_url)
+    with span("git mirror", module_name) as step:
+        returncode, _, stderr = await run(cmd)
+        step.status = returncode
+    if returncode == 0:
+        return True, f"Mirror ready for {module_name}"
+    return False, f"Failed to mirror {module_name}: {stderr}"
+
+
+async def clone_module(module_name, repo_url, depth=None, filter_spec=None, single_branch=False,
+                       shared=False):
+    """Async ``zelutil.core.installer.clone_module``"""
+    install_dir = await asyncio.to_thread(installer.get_install_dir)
+    target_dir = install_dir / module_name
+
+    await asyncio.to_thread(install_dir.mkdir, parents=True, exist_ok=True)
+    if target_dir.exists():
+        return False, f"Module '{module_name}' already exists at {target_dir}"
+
+    reference = None
+    if shared:
+        ok, message = await ensure_mirror(install_dir, module_name, repo_url)
+        if not ok:
+            return False, message
+        reference = get_mirror_path(install_dir, module_name)
+
+    cmd = installer.clone_command(repo_url, target_dir, depth, filter_spec, single_branch, reference)
+    with span("git clone", module_name) as step:
+        returncode, _, stderr = await run(cmd)
+        step.status = returncode
+    if returncode != 0:
+        return False, f"Failed to clone {module_name}: {stderr}"
+
+    await asyncio.to_thread(installer.record_clone, module_name, install_dir, depth,
+                            filter_spec, single_branch, shared)
+    return True, f"Successfully cloned {module_name}"
+
+
+async def clone_modules(module_names, jobs=DEFAULT_JOBS, **strategy):
+    """Async ``zelutil.core.installer.clone_modules``"""
+    install_dir = await asyncio.to_thread(installer.get_install_dir)
+    modules = await asyncio.to_thread(load_modules)
+
+    skipped = [name for name in module_names if (install_dir / name).exists()]
+    pending = [name for name in module_names if name not in skipped]
+    results = await _bounded(jobs, [
+        clone_module(name, modules[name]["git_url"], **strategy) for name in pending
+    ])
+
+    cloned = [name for name, (success, _) in zip(pending, results) if success]
+    failed = [(name, message) for name, (success, message) in zip(pending, results) if not success]
+    return cloned, skipped, failed
+
+
+async def fetch_module(module_dir, strategy=None, repo_url=None):
+    """Async ``zelutil.core.updater.fetch_module``"""
+    start = time.perf_counter()
+    if strategy and strategy.get("shared") and repo_url:
+        ok, message = await ensure_mirror(module_dir.parent, module_dir.name, repo_url)
+        if not ok:
+            return 1, message, time.perf_counter() - start
+    with span("git fetch", module_dir.name) as step:
+        returncode, _, stderr = await run(updater.FETCH_COMMAND, cwd=module_dir)
+        step.status = returncode
+    return returncode, stderr, time.perf_counter() - start
+
+
+async def compare_upstream(module_dir):
+    """Async ``zelutil.core.updater.compare_upstream``"""
+    head, upstream = updater.parse_upstream(*await run(updater.UPSTREAM_COMMAND, cwd=module_dir))
+    if head == upstream:
+        return updater.CURRENT, head, upstream
+    returncode, _, _ = await run(updater.ancestor_command(head, upstream), cwd=module_dir)
+    if returncode == 0:
+        return updater.BEHIND, head, upstream
+    returncode, _, _ = await run(updater.ancestor_command(upstream, head), cwd=module_dir)
+    if returncode == 0:
+        return updater.AHEAD, head, upstream
+    return updater.DIVERGED, head, upstream
+
+
+async def plan_updates(jobs=DEFAULT_JOBS, timings=None):
+    """Async ``zelutil.core.updater.plan_updates``"""
+    targets = await asyncio.to_thread(updater.update_targets)
+    if targets is None:
+        return {}, [], "No modules configured"
+    install_dir, modules, present, strategies = targets
+    if not present:
+        return {}, [], None
+
+    async def check(module):
+        module_dir = install_dir / module
+        returncode, stderr, elapsed = await fetch_module(module_dir, strategies.get(module),
+                                                         modules[module].get("git_url"))
+        if returncode != 0:
+            return elapsed, None, stderr
+        try:
+            return elapsed, await compare_upstream(module_dir), None
+        except RuntimeError as exc:
+            return elapsed, None, str(exc)
+
+    results = await _bounded(jobs, [check(m) for m in present])
+    plan, failed = updater.collect_plan(present, results, timings)
+    await asyncio.to_thread(updater.record_plan, plan)
+    return plan, failed, None
+
+
+async def apply_updates(plan, install_dir):
+    """Async ``zelutil.core.updater.apply_updates``"""
+    updated = []
+    failed = []
+    for module, entry in plan.items():
+        if entry["status"] != updater.BEHIND:
+            continue
+        with span("git merge", module) as step:
+            returncode, _, stderr = await run(updater.merge_command(entry),
+                                              cwd=install_dir / module)
+            step.status = returncode
+        if returncode == 0:
+            updated.append(module)
+        else:
+            failed.append((module, stderr))
+
+    await asyncio.to_thread(updater.record_applied, plan, updated, install_dir)
+    return updated, failed
+
+
+async def update_modules(jobs=DEFAULT_JOBS, timings=None, plan=None):
+    """Async ``zelutil.core.updater.update_modules``"""
+    planned, failed, error = await plan_updates(jobs=jobs, timings=timings)
+    if error:
+        return [], [], error
+    if plan is not None:
+        plan.update(planned)
+
+    install_dir = await asyncio.to_thread(installer.get_install_dir)
+    updated, apply_failed = await apply_updates(planned, install_dir)
+    failed += apply_failed + updater.diverged_failures(planned)
+    return updated, failed, None
+
+
+async def pip_install_editable(pip_exe, components, install_dir, batch=True, wheel_dir=None,
+                               errors=None):
+    """Async ``zelutil.core.installer.pip_install_editable``
+
+    Without ``batch``, components are installed one after another because
+    concurrent pip runs in one venv can corrupt it. Like the blocking
+    version, pip's output goes straight to the terminal; pass a dict as
+    ``errors`` to capture it instead and have it filled with the stderr of
+    each failed component.
+    """
+    capture = errors is not None
+    if wheel_dir is not None and components:
+        cmd = installer.pip_install_command(pip_exe, [install_dir / c for c in components],
+                                            wheel_dir)
+        with span("pip install", modules=list(components), offline=True) as step:
+            returncode, _, _ = await run(cmd, capture=capture)
+            step.status = returncode
+        if returncode == 0:
+            return []
+
+    if batch and len(components) > 1:
+        cmd = installer.pip_install_command(pip_exe, [install_dir / c for c in components])
+        with span("pip install", modules=list(components)) as step:
+            returncode, _, _ = await run(cmd, capture=capture)
+            step.status = returncode
+        if returncode == 0:
+            return []
+
+    failed = []
+    for component in components:
+        with span("pip install", component) as step:
+            cmd = installer.pip_install_command(pip_exe, [install_dir / component])
+            returncode, _, stderr = await run(cmd, capture=capture)
+            step.status = returncode
+        if returncode != 0:
+            failed.append(component)
+            if capture:
+                errors[component] = stderr
+    return failed
+
+
+async def _pip_wheel(name, cmd):
+    with span("pip wheel", name) as step:
+        step.status, _, _ = await run(cmd)
+    return step.status
+
+
+async def build_wheels(pip_exe, sources, wheel_dir, jobs=DEFAULT_JOBS):
+    """Async ``zelutil.utils.build_plan.build_wheels``"""
+    graph = await asyncio.to_thread(build_plan.dependency_graph, sources)
+    await asyncio.to_thread(wheel_dir.mkdir, parents=True, exist_ok=True)
+    failed = []
+
+    async def build(module):
+        staging = await asyncio.to_thread(build_plan.staging_dir, wheel_dir, module)
+        try:
+            returncode = await _pip_wheel(
+                module, build_plan.build_command(pip_exe, staging, wheel_dir, sources[module])
+            )
+            if returncode == 0:
+                await asyncio.to_thread(build_plan.publish_wheels, staging, wheel_dir)
+            return returncode
+        finally:
+            await asyncio.to_thread(shutil.rmtree, staging, ignore_errors=True)
+
+    for ready in build_plan.ready_levels(graph, failed):
+        results = await _bounded(jobs, [build(m) for m in ready])
+        failed += [m for m, returncode in zip(ready, results) if returncode != 0]
+    return failed
+
+
+async def fill_wheelhouse(pip_exe, components, install_dir, jobs=DEFAULT_JOBS):
+    """Async ``zelutil.core.wheelhouse.fill_wheelhouse``"""
+    wheel_dir, stale, requirements = await asyncio.to_thread(
+        wheelhouse.plan_wheelhouse, components, install_dir
+    )
+    if not stale:
+        return wheel_dir
+
+    if requirements and await _pip_wheel(
+        None, wheelhouse.wheel_command(pip_exe, wheel_dir, requirements)
+    ) != 0:
+        failed = stale
+    else:
+        failed = await build_wheels(pip_exe, {c: install_dir / c for c in stale}, wheel_dir, jobs)
+    return await asyncio.to_thread(wheelhouse.record_wheelhouse, stale, failed, install_dir)
+
+
+async def install_modules(modules, batch=True, wheelhouse=True, template=False,
+                          jobs=DEFAULT_JOBS):
+    """Async ``zelutil.core.installer.install_modules``
+
+    Template provisioning runs the blocking installer in a worker thread,
+    since cloning the template is mostly file copying.
+    """
+    install_dir = await asyncio.to_thread(installer.get_install_dir)
+    venv_path = await asyncio.to_thread(installer.get_venv_path)
+
+    if template and not venv_path.exists() and venv_template.is_supported():
+        return await asyncio.to_thread(installer.install_modules, modules, batch, wheelhouse,
+                                       template, jobs)
+
+    if not venv_path.exists():
+        with span("venv create", path=str(venv_path)) as step:
+            returncode, _, stderr = await run([sys.executable, "-m", "venv", venv_path])
+            step.status = returncode
+        if returncode != 0:
+            raise RuntimeError(f"Failed to create virtual environment at {venv_path}: {stderr}")
+
+    components = await asyncio.to_thread(installer.ordered_components, modules, install_dir)
+    pip_exe = installer.get_pip_exe(venv_path)
+    wheel_dir = None
+    if wheelhouse:
+        wheel_dir = await fill_wheelhouse(pip_exe, components, install_dir, jobs)
+    failed = await pip_install_editable(pip_exe, components, install_dir, batch=batch,
+                                        wheel_dir=wheel_dir)
+
+    succeeded = [c for c in components if c not in failed]
+    await asyncio.to_thread(venv_template.write_record, venv_path,
+                            {c: install_dir / c for c in succeeded})
+    await asyncio.to_thread(installer.finish_install, components, failed, venv_path, install_dir)
+    return not failed
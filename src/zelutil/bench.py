@@ -0,0 +1,194 @@
+"""Startup and hot-path benchmarks for zelutil.
+
+Run with ``python -m zelutil.bench``. Every benchmark runs against a
+temporary HOME so real state is never touched. Results are printed as JSON
+and can be saved with ``--output`` and checked against an earlier run with
+``--compare``.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+# Startup scenarios: name -> (code run in a fresh interpreter, modules it must not load)
+STARTUP_BENCHMARKS = {
+    "import zelutil.utils.state": (
+        "import zelutil.utils.state",
+        ["subprocess", "zelutil.core.installer", "zelutil.utils.integration"],
+    ),
+    "import zelutil": (
+        "import zelutil",
+        ["subprocess", "zelutil.core.installer", "zelutil.utils.integration"],
+    ),
+    "zelutil --help": (
+        "from zelutil.cli import util\n"
+        "try:\n"
+        "    util(['--help'], prog_name='zelutil')\n"
+        "except SystemExit:\n"
+        "    pass",
+        ["subprocess", "zelutil.core.installer"],
+    ),
+}
+
+
+def _home_env(home):
+    """Environment variables pointing Path.home() at ``home``."""
+    return {"HOME": str(home), "USERPROFILE": str(home)}
+
+
+def bench_startup(code, forbidden, home, repeat=5):
+    """Time ``code`` in fresh interpreters.
+
+    Every run starts a new interpreter, so none of them is warm in the
+    sense of reusing loaded modules. The first run is reported on its own,
+    since it may also pay for compiling bytecode and filling the OS file
+    cache, and the median of the rest as the typical startup. Any module
+    from ``forbidden`` that ended up loaded is reported too.
+    """
+    script = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        f"{code}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"print('@@', elapsed, *[m for m in {forbidden!r} if m in sys.modules])\n"
+    )
+    env = dict(os.environ, **_home_env(home))
+    timings = []
+    loaded = []
+    for _ in range(max(2, repeat)):
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True,
+                                text=True, check=True, env=env)
+        fields = result.stdout[result.stdout.rindex("@@"):].split()[1:]
+        timings.append(float(fields[0]))
+        loaded = fields[1:]
+    return {
+        "first": timings[0],
+        "median": statistics.median(timings[1:]),
+        "unexpected_imports": loaded,
+    }
+
+
+def bench_call(func, number=200, repeat=5):
+    """Best per-call time of ``func`` over ``repeat`` rounds of ``number`` calls."""
+    rounds = timeit.repeat(func, number=number, repeat=repeat)
+    return {"per_call": min(rounds) / number}
+
+
+def _seed_home(home):
+    """Create paths, config and fake module checkouts under a temporary HOME."""
+    from .core.installer import get_install_dir
+    from .core.registry import load_modules
+    from .utils.config import save_config
+    from .utils.paths import set_paths
+
+    set_paths({key: str(home / key) for key in ("vault", "media", "projects")})
+    save_config({"theme": "dark", "recent": list(range(50))})
+    save_config({"interval": 25}, "zeltimer")
+    install_dir = get_install_dir()
+    for name in list(load_modules())[::2]:
+        (install_dir / name).mkdir(parents=True, exist_ok=True)
+
+
+def run_hot_paths(home, number=200, repeat=5):
+    """Benchmark the functions sister apps call most often.
+
+    ``load_modules`` is memoized, so its cache is cleared before every call
+    to time what each new process pays: reading the compiled index.
+    """
+    from .core.installer import get_install_dir
+    from .core.registry import load_modules
+    from .utils.config import load_config, save_config
+    from .utils.integration import get_installed_apps
+    from .utils.paths import get_path, set_path
+
+    _seed_home(home)
+    counter = iter(range(10 ** 9))
+    calls = {
+        "get_path": lambda: get_path("vault"),
+        "set_path": lambda: set_path("scratch", next(counter)),
+        "load_config": lambda: load_config("zeltimer"),
+        "save_config": lambda: save_config({"interval": next(counter)}, "zeltimer"),
+        "load_modules": lambda: (load_modules.cache_clear(), load_modules()),
+        "get_installed_apps": get_installed_apps,
+        "get_install_dir": get_install_dir,
+    }
+    return {name: bench_call(func, number, repeat) for name, func in calls.items()}
+
+
+def run_benchmarks(repeat=5, number=200):
+    """Run every benchmark against a temporary HOME and return the results."""
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "startup": {},
+        "hot_paths": {},
+    }
+    saved = {key: os.environ.get(key) for key in ("HOME", "USERPROFILE")}
+    with tempfile.TemporaryDirectory(prefix="zelutil-bench-") as tmp:
+        home = Path(tmp)
+        for name, (code, forbidden) in STARTUP_BENCHMARKS.items():
+            results["startup"][name] = bench_startup(code, forbidden, home, repeat)
+        os.environ.update(_home_env(home))
+        try:
+            results["hot_paths"] = run_hot_paths(home, number, repeat)
+        finally:
+            for key, value in saved.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+    return results
+
+
+def compare(results, baseline, threshold=1.25):
+    """List benchmarks that got slower than ``threshold`` times the baseline."""
+    regressions = []
+    for section, metric in (("startup", "median"), ("hot_paths", "per_call")):
+        for name, current in results.get(section, {}).items():
+            old = baseline.get(section, {}).get(name)
+            if not old or not old.get(metric):
+                continue
+            ratio = current[metric] / old[metric]
+            if ratio > threshold:
+                regressions.append(f"{section}/{name}: {ratio:.2f}x slower")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark zelutil startup and hot paths")
+    parser.add_argument("--repeat", type=int, default=5, help="Rounds per benchmark")
+    parser.add_argument("--number", type=int, default=200, help="Calls per hot-path round")
+    parser.add_argument("--output", type=Path, help="Write JSON results to this file")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Slowdown ratio reported as a regression")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.repeat, args.number)
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output)
+    print(output)
+
+    failures = [
+        f"startup/{name}: imported {', '.join(r['unexpected_imports'])}"
+        for name, r in results["startup"].items() if r["unexpected_imports"]
+    ]
+    if args.compare:
+        with open(args.compare) as f:
+            failures += compare(results, json.load(f), args.threshold)
+
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,54 @@
+import importlib
+
 import click
 
-from .commands import module, manage
 
-@click.group()
+class LazyGroup(click.Group):
+    """Click group that imports its subcommands only when they are invoked.
+
+    ``lazy_subcommands`` maps a command name to ``(import_path, short_help)``
+    where ``import_path`` is ``"module.path:attribute"``. The short help is
+    shown in ``--help`` so listing commands does not import them.
+    """
+
+    def __init__(self, *args, lazy_subcommands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.lazy_subcommands and cmd_name not in self.commands:
+            import_path, _ = self.lazy_subcommands[cmd_name]
+            module_name, attr = import_path.split(":")
+            module = importlib.import_module(module_name, package=__package__)
+            self.add_command(getattr(module, attr), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands(self, ctx, formatter):
+        rows = []
+        for name in self.list_commands(ctx):
+            if name in self.commands:
+                cmd = self.commands[name]
+                if cmd.hidden:
+                    continue
+                rows.append((name, cmd.get_short_help_str(formatter.width)))
+            else:
+                rows.append((name, self.lazy_subcommands[name][1]))
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
+
+
+@click.group(cls=LazyGroup, lazy_subcommands={
+    "completion": (".commands.completion_commands:completion",
+                   "Print a shell completion script that reads a static cache"),
+    "module": (".commands.module_commands:module", "Manage all zel modules"),
+    "manage": (".commands.manage_commands:manage", "Manage zel configuration"),
+    "serve": (".commands.serve_commands:serve", "Serve zel state over a Unix socket"),
+    "summary": (".commands.summary_commands:summary", "Summarize activity across zel apps"),
+})
 def util():
     """ZelUtil — Shared configuration for Zel CLI tools"""
     pass
-
-# Register command groups
-util.add_command(module)
-util.add_command(manage)
@@ -1,4 +1,19 @@
-from .module_commands import module
-from .manage_commands import manage
+import importlib
 
-__all__ = ["module", "manage"]
+# Command groups are imported on first access so loading one group does not
+# pull in the dependencies of the others.
+_COMMANDS = {
+    "completion": ".completion_commands",
+    "module": ".module_commands",
+    "manage": ".manage_commands",
+    "serve": ".serve_commands",
+    "summary": ".summary_commands",
+}
+
+__all__ = ["completion", "module", "manage", "serve", "summary"]
+
+
+def __getattr__(name):
+    if name in _COMMANDS:
+        return getattr(importlib.import_module(_COMMANDS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
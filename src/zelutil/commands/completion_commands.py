@@ -0,0 +1,29 @@
+import sys
+import click
+
+from ..core.completion import SHELLS
+
+
+@click.command()
+@click.argument("shell", required=False, type=click.Choice(SHELLS))
+@click.option("--refresh", is_flag=True, help="Rebuild the completion cache")
+def completion(shell, refresh):
+    """Print a shell completion script that reads a static cache
+
+    The cache of commands, options, module names and path keys lives in the
+    state dir and is refreshed when the registry changes or modules are
+    installed, so completing never starts Python.
+    """
+    from ..core.completion import completion_script, get_completion_file, write_completion_cache
+
+    if not shell and not refresh:
+        click.echo("Error: Give a shell (bash, zsh or fish) or --refresh.", err=True)
+        sys.exit(1)
+    
+    if refresh or not get_completion_file().exists():
+        write_completion_cache()
+        if refresh:
+            click.echo(f"✅ Wrote {get_completion_file()}", err=bool(shell))
+    
+    if shell:
+        click.echo(completion_script(shell), nl=False)
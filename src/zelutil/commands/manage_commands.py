@@ -1,7 +1,8 @@
-import json
+import sys
 import click
 
-from ..utils.state import resolve_state_dir
+from ..utils.state import resolve_state_dir, read_state_file
+from ..core import DEFAULT_JOBS
 from ..core.registry import get_module_names, load_modules
 
 
@@ -24,14 +25,91 @@ def list_modules():
         click.echo(f"  • {name} - {info['description']}")
 
 
+@manage.command("installed")
+@click.option("--verify", is_flag=True, help="Re-scan the install directory first")
+def list_installed(verify):
+    """List cloned and installed zel modules"""
+    from ..core.manifest import load_manifest
+    from ..utils.integration import get_installed_apps
+
+    names = get_installed_apps(verify=verify)
+    if not names:
+        click.echo("No modules installed.")
+        return
+
+    manifest = load_manifest()
+    for name in names:
+        entry = manifest.get(name, {})
+        version = entry.get("version") or "?"
+        commit = (entry.get("commit") or "")[:8]
+        click.echo(f"  • {name} {version} ({entry.get('status', 'cloned')}, {commit})")
+
+
 @manage.command("paths")
-def list_paths():
-    """List all configured paths"""
-    paths_file = resolve_state_dir() / "paths.json"
-    if paths_file.exists():
-        with open(paths_file) as f:
-            paths = json.load(f)
-            for key, value in paths.items():
-                click.echo(f"{key}: {value}")
+@click.argument("key", required=False)
+def list_paths(key):
+    """List all configured paths, or just KEY"""
+    paths = read_state_file(resolve_state_dir() / "paths.json")
+    if key is not None:
+        if paths is None or key not in paths:
+            click.echo(f"Error: Path '{key}' is not configured.", err=True)
+            sys.exit(1)
+        click.echo(f"{key}: {paths[key]}")
+    elif paths is not None:
+        for key, value in paths.items():
+            click.echo(f"{key}: {value}")
     else:
-        click.echo("No paths configured")
\ No newline at end of file
+        click.echo("No paths configured")
+
+
+@manage.command("mirrors")
+@click.option("--jobs", "-j", default=DEFAULT_JOBS, show_default=True,
+              type=click.IntRange(min=1), help="Number of mirrors to fetch in parallel")
+def refresh_all_mirrors(jobs):
+    """Refresh the shared module mirrors"""
+    from ..core.installer import get_install_dir
+    from ..core.mirrors import refresh_mirrors
+
+    refreshed, failed = refresh_mirrors(get_install_dir(), load_modules(), jobs=jobs)
+    if refreshed:
+        click.echo(f"✅ Refreshed: {', '.join(refreshed)}")
+    for name, message in failed:
+        click.echo(f"❌ {message}", err=True)
+    if not refreshed and not failed:
+        click.echo("No shared mirrors found.")
+
+
+@manage.command("migrate")
+@click.argument("app_name")
+def migrate_storage(app_name):
+    """Import an app's JSON data files into SQLite storage"""
+    from ..utils.storage import migrate_json
+
+    try:
+        counts = migrate_json(app_name)
+    except ValueError as exc:
+        click.echo(f"❌ {exc}", err=True)
+        sys.exit(1)
+    if not counts:
+        click.echo(f"No JSON data files found for {app_name}.")
+        return
+    for collection, count in counts.items():
+        click.echo(f"✅ {collection}: {count} items")
+
+
+@manage.command("compact")
+@click.argument("app_name")
+@click.option("--collection", default="completed", show_default=True,
+              help="Which item log to compact")
+@click.option("--legacy-json", is_flag=True,
+              help="Also write the log as <collection>.json for older readers")
+def compact_log(app_name, collection, legacy_json):
+    """Compact an app's append-only item log"""
+    from ..utils.archive import ItemLog
+
+    log = ItemLog(app_name, collection)
+    if not log.path.exists():
+        click.echo(f"No {collection} log found for {app_name}.")
+        return
+    kept = log.compact(legacy_json=legacy_json)
+    click.echo(f"✅ Compacted {log.path} ({kept} items)")
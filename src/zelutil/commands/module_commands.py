@@ -1,9 +1,14 @@
 import sys
+from contextlib import nullcontext
+
 import click
 
-from ..core.installer import clone_module, install_modules
+from ..core import DEFAULT_JOBS
+from ..core.events import tracing
+from ..core.fingerprint import changed_modules, load_install_state, record_installed
+from ..core.installer import clone_modules, get_install_dir, install_modules
 from ..core.registry import load_modules, validate_module, get_module_names
-from ..core.updater import update_modules
+from ..core.updater import BEHIND, CURRENT, plan_updates, update_modules
 
 @click.group()
 def module():
@@ -11,56 +16,167 @@ def module():
     pass
 
 @module.command("get")
-@click.argument("module")
-def get_module(module):
-    """Clone a module to the installation directory"""
-    modules = load_modules()
-    if not validate_module(module):
+@click.argument("names", nargs=-1)
+@click.option("--all", "get_all", is_flag=True, help="Clone every module in the registry")
+@click.option("--jobs", "-j", default=DEFAULT_JOBS, show_default=True,
+              type=click.IntRange(min=1), help="Number of modules to clone in parallel")
+@click.option("--depth", type=click.IntRange(min=1), help="Shallow clone with this many commits")
+@click.option("--filter", "filter_spec", metavar="SPEC",
+              help="Partial clone filter, e.g. blob:none")
+@click.option("--single-branch", is_flag=True, help="Only fetch the default branch")
+@click.option("--shared", is_flag=True,
+              help="Borrow objects from a shared mirror under the install dir")
+@click.option("--trace", type=click.Path(dir_okay=False), help="Write a Chrome trace of each step")
+def get_module(names, get_all, jobs, depth, filter_spec, single_branch, shared, trace):
+    """Clone modules to the installation directory"""
+    if get_all:
+        names = get_module_names()
+    if not names:
+        click.echo("Error: Give one or more module names, or --all.", err=True)
+        sys.exit(1)
+    
+    unknown = [name for name in names if not validate_module(name)]
+    if unknown:
         available = ", ".join(sorted(get_module_names()))
-        click.echo(f"Error: Module '{module}' not found.", err=True)
+        for name in unknown:
+            click.echo(f"Error: Module '{name}' not found.", err=True)
         click.echo(f"Available modules: {available}", err=True)
         sys.exit(1)
-
-    module_info = modules[module]
-    success, message = clone_module(module, module_info["git_url"])
     
-    if success:
-        click.echo(f"✅ {message}")
-    else:
+    names = list(dict.fromkeys(names))
+    with tracing(trace) if trace else nullcontext():
+        cloned, skipped, failed = clone_modules(
+            names, jobs=jobs, depth=depth, filter_spec=filter_spec,
+            single_branch=single_branch, shared=shared
+        )
+    
+    for name in cloned:
+        click.echo(f"✅ Successfully cloned {name}")
+    for name in skipped:
+        click.echo(f"⏭️  Skipped {name} (already exists)")
+    for name, message in failed:
         click.echo(f"❌ {message}", err=True)
+    
+    if len(names) > 1:
+        click.echo(f"Cloned {len(cloned)}, skipped {len(skipped)}, failed {len(failed)}")
+    if failed:
         sys.exit(1)
 
 @module.command("install")
-def install_module():
+@click.option("--batch/--no-batch", default=True, show_default=True,
+              help="Install all modules in a single pip run")
+@click.option("--wheelhouse/--no-wheelhouse", default=True, show_default=True,
+              help="Build and reuse cached wheels under the install dir")
+@click.option("--template", is_flag=True,
+              help="Clone a missing venv from the template venv instead of building it")
+@click.option("--jobs", "-j", default=DEFAULT_JOBS, show_default=True,
+              type=click.IntRange(min=1), help="Number of independent modules to build at once")
+@click.option("--trace", type=click.Path(dir_okay=False), help="Write a Chrome trace of each step")
+def install_module(batch, wheelhouse, template, jobs, trace):
     """Install all zel modules"""
     modules = load_modules()
     if not modules:
         click.echo("No modules configured.")
         return
     
-    success = install_modules(modules)
+    with tracing(trace) if trace else nullcontext():
+        success = install_modules(modules, batch=batch, wheelhouse=wheelhouse, template=template,
+                                  jobs=jobs)
     if success:
         click.echo("✅ All modules installed successfully")
     else:
         click.echo("❌ Installation failed", err=True)
+        sys.exit(1)
 
 @module.command("update")
-def update_all():
+@click.option("--jobs", "-j", default=DEFAULT_JOBS, show_default=True,
+              type=click.IntRange(min=1), help="Number of modules to pull in parallel")
+@click.option("--dry-run", is_flag=True,
+              help="Fetch and show pending updates without touching any working tree")
+@click.option("--trace", type=click.Path(dir_okay=False), help="Write a Chrome trace of each step")
+def update_all(jobs, dry_run, trace):
     """Update all installed zel modules"""
-    updated, failed, error = update_modules()
+    with tracing(trace) if trace else nullcontext():
+        if dry_run:
+            _show_plan(jobs)
+        else:
+            _update_all(jobs)
+
+def _describe(entry):
+    """Describe one planned update as old→new short commits"""
+    status = entry["status"]
+    if status == CURRENT:
+        return f"up to date at {entry['from'][:10]}"
+    arrow = f"{entry['from'][:10]} → {entry['to'][:10]}"
+    if status == BEHIND:
+        return arrow
+    return f"{arrow} ({status}, will not fast-forward)"
+
+def _show_plan(jobs):
+    plan, failed, error = plan_updates(jobs=jobs)
     
     if error:
         click.echo(error)
         return
     
+    for name, entry in plan.items():
+        click.echo(f"  {name}: {_describe(entry)}")
+    for module, error_msg in failed:
+        click.echo(f"❌ Failed to fetch {module}: {error_msg}", err=True)
+    
+    pending = [name for name, entry in plan.items() if entry["status"] == BEHIND]
+    if pending:
+        click.echo(f"{len(pending)} module(s) would be updated: {', '.join(pending)}")
+    elif not plan:
+        click.echo("No modules found to update.")
+    elif all(entry["status"] == CURRENT for entry in plan.values()):
+        click.echo("All modules are up to date.")
+
+def _update_all(jobs):
+    timings = {}
+    plan = {}
+    updated, failed, error = update_modules(jobs=jobs, timings=timings, plan=plan)
+    
+    if error:
+        click.echo(error)
+        return
+    
+    for name, elapsed in timings.items():
+        line = f"  {name}: {elapsed:.2f}s"
+        if name in plan:
+            line += f"  {_describe(plan[name])}"
+        click.echo(line)
+    
     if updated:
         click.echo(f"✅ Updated: {', '.join(updated)}")
-        click.echo("Reinstalling updated modules...")
-        install_module.callback()
+    
+    # Check every installed module, not just this run's updates, so a
+    # reinstall that failed last time is retried
+    modules = load_modules()
+    install_dir = get_install_dir()
+    installed = load_install_state()
+    candidates = {name: modules[name] for name in plan if name in updated or name in installed}
+    changed = changed_modules(candidates, install_dir)
+    unchanged = [name for name in updated if name not in changed]
+    reinstall_failed = False
+    if changed:
+        click.echo(f"Reinstalling changed modules: {', '.join(changed)}")
+        if not install_modules(changed, jobs=jobs):
+            click.echo("❌ Reinstalling changed modules failed", err=True)
+            reinstall_failed = True
+    if unchanged:
+        record_installed(unchanged, install_dir)
+        click.echo(f"No build changes: {', '.join(unchanged)}")
     
     if failed:
         for module, error_msg in failed:
             click.echo(f"❌ Failed to update {module}: {error_msg}", err=True)
     
     if not updated and not failed:
-        click.echo("No modules found to update.")
\ No newline at end of file
+        if plan:
+            click.echo("All modules are up to date.")
+        else:
+            click.echo("No modules found to update.")
+    
+    if failed or reinstall_failed:
+        sys.exit(1)
@@ -0,0 +1,19 @@
+import sys
+import click
+
+
+@click.command()
+def serve():
+    """Serve paths, configs and the registry over a Unix socket"""
+    from ..core.server import serve as run_server
+
+    def ready(path):
+        click.echo(f"Serving zel state on {path} (Ctrl+C to stop)")
+
+    try:
+        run_server(on_ready=ready)
+    except RuntimeError as exc:
+        click.echo(f"❌ {exc}", err=True)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        click.echo("Stopped.")
@@ -0,0 +1,51 @@
+import datetime
+import json
+import sys
+import click
+
+from ..core import DEFAULT_JOBS
+from ..core.summary import summarize
+
+
+@click.command()
+@click.option("--date", "day", metavar="YYYY-MM-DD", help="Summarize one day (default: today)")
+@click.option("--range", "day_range", nargs=2, metavar="START END",
+              help="Summarize every day from START to END inclusive")
+@click.option("--app", "apps", multiple=True, help="Only include these apps")
+@click.option("--jobs", "-j", default=DEFAULT_JOBS, show_default=True,
+              type=click.IntRange(min=1), help="Number of apps to index in parallel")
+@click.option("--verbose", "-v", is_flag=True, help="List the items behind each count")
+@click.option("--json", "as_json", is_flag=True, help="Print the summary as JSON")
+def summary(day, day_range, apps, jobs, verbose, as_json):
+    """Summarize activity across zel apps"""
+    if day and day_range:
+        click.echo("Error: Use either --date or --range, not both.", err=True)
+        sys.exit(1)
+    if day_range:
+        since, until = day_range
+    else:
+        since = until = day or datetime.date.today().isoformat()
+    for value in (since, until):
+        try:
+            datetime.date.fromisoformat(value)
+        except ValueError:
+            click.echo(f"Error: '{value}' is not a YYYY-MM-DD date.", err=True)
+            sys.exit(1)
+
+    result = summarize(since, until, apps=apps or None, jobs=jobs, labels=verbose)
+    if as_json:
+        click.echo(json.dumps(result, indent=2))
+        return
+    if not result:
+        click.echo("No activity found.")
+        return
+
+    for date, per_app in result.items():
+        click.echo(date)
+        for app_name, collections in per_app.items():
+            counts = ", ".join(f"{entry['count']} {name}" for name, entry in collections.items())
+            click.echo(f"  • {app_name}: {counts}")
+            if verbose:
+                for name, entry in collections.items():
+                    for label in entry["labels"]:
+                        click.echo(f"      [{name}] {label}")
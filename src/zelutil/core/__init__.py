@@ -1 +1,4 @@
-# Core business logic for zelutil
\ No newline at end of file
+# Core business logic for zelutil
+
+# Parallel git, pip and reader work used unless --jobs says otherwise
+DEFAULT_JOBS = 4
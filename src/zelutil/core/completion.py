@@ -0,0 +1,103 @@
+from ..utils.registry import suggest_paths
+from ..utils.state import atomic_write, resolve_state_dir
+
+# Command arguments completed from a word list in the cache
+ARGUMENT_WORDS = {
+    "zelutil:module:get": "modules",
+    "zelutil:manage:migrate": "modules",
+    "zelutil:manage:compact": "modules",
+    "zelutil:manage:paths": "paths",
+    "zelutil:completion": "shells",
+}
+
+SHELLS = ("bash", "zsh", "fish")
+
+
+def get_completion_file():
+    """Get the static completion cache read by the shell scripts
+
+    Each line is ``<kind> <key> <words...>``: ``cmd`` lists the subcommands
+    of a command path, ``opt`` its options, ``arg`` names the word list
+    completing its arguments and ``words`` holds a word list.
+    """
+    return resolve_state_dir() / "completion.cache"
+
+
+def command_entries(root=None):
+    """Walk the CLI and return ``(kind, key, words)`` entries for every command
+
+    Lazy command groups are imported, so this is only run when the cache
+    is rebuilt, never while completing.
+    """
+    import click
+
+    if root is None:
+        from ..cli import util as root
+
+    entries = []
+
+    def walk(command, key, ctx):
+        options = ["--help"]
+        for param in command.params:
+            if isinstance(param, click.Option):
+                options += param.opts + param.secondary_opts
+        entries.append(("opt", key, sorted(set(options))))
+        if isinstance(command, click.Group):
+            names = command.list_commands(ctx)
+            entries.append(("cmd", key, names))
+            for name in names:
+                sub = command.get_command(ctx, name)
+                walk(sub, f"{key}:{name}", click.Context(sub, info_name=name, parent=ctx))
+        elif key in ARGUMENT_WORDS:
+            entries.append(("arg", key, [ARGUMENT_WORDS[key]]))
+
+    walk(root, "zelutil", click.Context(root, info_name="zelutil"))
+    return entries
+
+
+def word_entries(modules=None):
+    """Return the ``words`` entries for module names, path keys and shells"""
+    if modules is None:
+        from .registry import load_modules
+        modules = load_modules()
+    return [
+        ("words", "modules", sorted(modules)),
+        ("words", "paths", suggest_paths()),
+        ("words", "shells", list(SHELLS)),
+    ]
+
+
+def _write(entries):
+    with atomic_write(get_completion_file()) as f:
+        f.write("# zelutil completion cache\n")
+        for kind, key, words in entries:
+            f.write(" ".join([kind, key, *words]) + "\n")
+
+
+def write_completion_cache(modules=None):
+    """Rebuild the whole completion cache, including the command tree"""
+    _write(command_entries() + word_entries(modules))
+
+
+def refresh_completion_cache(modules=None):
+    """Rewrite the word lists of an existing cache, keeping its command tree
+
+    Does nothing when no cache has been generated, so registry reads never
+    pay for importing the CLI.
+    """
+    path = get_completion_file()
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = [line.split() for line in f if line.strip() and not line.startswith("#")]
+    except FileNotFoundError:
+        return
+    commands = [(parts[0], parts[1], parts[2:]) for parts in lines if parts[0] != "words"]
+    _write(commands + word_entries(modules))
+
+
+def completion_script(shell):
+    """Return the completion script for ``shell``"""
+    from importlib import resources
+    return resources.files("zelutil.data").joinpath("completion", f"zelutil.{shell}").read_text(
+        encoding="utf-8"
+    )
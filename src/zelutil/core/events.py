@@ -0,0 +1,140 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Callbacks receiving every progress event
+_listeners = []
+_listeners_lock = threading.Lock()
+
+
+def add_listener(callback):
+    """Register ``callback(event)`` to receive progress events
+
+    Events are dicts with ``event`` (``"start"`` or ``"end"``), ``name``,
+    ``module``, ``time`` (``time.perf_counter()``), ``thread``, ``task`` (the
+    id of the running asyncio task, or None) and any extra fields of the
+    step. End events add ``duration`` in seconds and
+    ``status`` (an exit code, ``"ok"`` or ``"error"``). Callbacks may be
+    called from worker threads.
+    """
+    with _listeners_lock:
+        _listeners.append(callback)
+
+
+def remove_listener(callback):
+    """Stop sending events to ``callback``"""
+    with _listeners_lock:
+        if callback in _listeners:
+            _listeners.remove(callback)
+
+
+def emit(event):
+    for callback in list(_listeners):
+        callback(event)
+
+
+def _current_task():
+    """Get the id of the running asyncio task, or None outside one"""
+    # Only asyncio callers can be inside a task, so never import it here
+    asyncio = sys.modules.get("asyncio")
+    if asyncio is None:
+        return None
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        return None
+    return id(task) if task is not None else None
+
+
+class Span:
+    """A timed step; set ``status`` to its exit code or outcome before it ends."""
+
+    def __init__(self, name, module, fields):
+        self.name = name
+        self.module = module
+        self.fields = fields
+        self.status = None
+        self.start = None
+
+
+@contextmanager
+def span(name, module=None, **fields):
+    """Emit start and end events around a step such as a clone or pip run"""
+    step = Span(name, module, fields)
+    if not _listeners:
+        yield step
+        return
+
+    step.start = time.perf_counter()
+    base = {"name": name, "module": module, "thread": threading.get_ident(),
+            "task": _current_task(), **fields}
+    emit({"event": "start", "time": step.start, **base})
+    try:
+        yield step
+    except BaseException:
+        if step.status is None:
+            step.status = "error"
+        raise
+    finally:
+        end = time.perf_counter()
+        emit({
+            "event": "end",
+            "time": end,
+            "duration": end - step.start,
+            "status": "ok" if step.status is None else step.status,
+            **base,
+        })
+
+
+class TraceRecorder:
+    """Collect end events as Chrome trace-event ``X`` records.
+
+    Each thread, and each asyncio task, gets its own track: steps sharing
+    a track must nest, and concurrent tasks on one event loop thread
+    overlap freely.
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.events = []
+        self.lock = threading.Lock()
+
+    def __call__(self, event):
+        if event["event"] != "end":
+            return
+        args = {"status": event["status"]}
+        if event["module"]:
+            args["module"] = event["module"]
+        label = f"{event['name']} {event['module']}" if event["module"] else event["name"]
+        record = {
+            "name": label,
+            "cat": event["name"],
+            "ph": "X",
+            "ts": (event["time"] - event["duration"] - self.origin) * 1e6,
+            "dur": event["duration"] * 1e6,
+            "pid": os.getpid(),
+            "tid": event["task"] or event["thread"],
+            "args": args,
+        }
+        with self.lock:
+            self.events.append(record)
+
+    def write(self, path):
+        """Write the collected events as a Chrome trace file"""
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f, indent=2)
+
+
+@contextmanager
+def tracing(path):
+    """Record every step run inside the block to a Chrome trace file at ``path``"""
+    recorder = TraceRecorder()
+    add_listener(recorder)
+    try:
+        yield recorder
+    finally:
+        remove_listener(recorder)
+        recorder.write(path)
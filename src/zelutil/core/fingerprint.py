@@ -0,0 +1,59 @@
+import subprocess
+
+from ..utils.state import resolve_state_dir, read_state_file, state_transaction
+from ..utils.venv_template import build_fingerprint
+
+
+def get_install_state_file():
+    """Get the file recording what was last installed for each module"""
+    return resolve_state_dir() / "install-state.json"
+
+
+def load_install_state():
+    """Load recorded commits and build fingerprints keyed by module"""
+    return dict(read_state_file(get_install_state_file(), {}, strict=False))
+
+
+def get_head_commit(module_dir):
+    """Get the HEAD commit of a module checkout, or None if unavailable"""
+    result = subprocess.run(
+        ["git", "rev-parse", "HEAD"],
+        cwd=module_dir,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip()
+
+
+def changed_modules(modules, install_dir):
+    """Return the subset of modules whose build files changed since last install
+
+    A module whose HEAD matches the recorded commit is skipped without
+    hashing. Modules with no record are always considered changed.
+    """
+    state = load_install_state()
+    changed = {}
+    for name, info in modules.items():
+        module_dir = install_dir / name
+        record = state.get(name)
+        if record is None:
+            changed[name] = info
+            continue
+        if get_head_commit(module_dir) == record.get("commit"):
+            continue
+        if build_fingerprint(module_dir) != record.get("build"):
+            changed[name] = info
+    return changed
+
+
+def record_installed(names, install_dir):
+    """Record the current commit and build fingerprint for installed modules"""
+    with state_transaction(path=get_install_state_file()) as state:
+        for name in names:
+            module_dir = install_dir / name
+            state[name] = {
+                "commit": get_head_commit(module_dir),
+                "build": build_fingerprint(module_dir),
+            }
@@ -1,26 +1,30 @@
-import json
 import os
 import platform
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from ..utils.state import resolve_state_dir
+from ..utils.state import resolve_state_dir, resolve_state_file, read_state_file, state_transaction
+from ..utils import venv_template
+from ..utils.build_plan import install_order
+from . import DEFAULT_JOBS
+from .completion import write_completion_cache
+from .events import span
+from .fingerprint import record_installed
+from .manifest import CLONED, INSTALLED, update_manifest
+from .mirrors import ensure_mirror, get_mirror_path
+from .registry import load_modules
+from .wheelhouse import fill_wheelhouse
 
 
 def get_install_dir():
     """Get installation directory from stored paths or default"""
-    state_dir = resolve_state_dir()
-    paths_file = state_dir / "paths.json"
-    
-    if paths_file.exists():
-        try:
-            with open(paths_file, 'r') as f:
-                paths_data = json.load(f)
-                if "install_dir" in paths_data:
-                    return Path(paths_data["install_dir"])
-        except (json.JSONDecodeError, KeyError):
-            pass
+    paths_file = resolve_state_dir() / "paths.json"
+    
+    paths_data = read_state_file(paths_file, {}, strict=False)
+    if isinstance(paths_data, dict) and "install_dir" in paths_data:
+        return Path(paths_data["install_dir"])
     
     if platform.system() == "Windows":
         return Path.home() / "AppData" / "Local" / "zel"
@@ -67,37 +71,175 @@ def add_to_path(bin_path):
     print(f"Added to {shell_config}")
 
 
-def install_modules(modules):
-    """Install zel modules to virtual environment"""
+def get_venv_bin(venv_path):
+    """Get the scripts directory of a venv"""
+    if platform.system() == "Windows":
+        return venv_path / "Scripts"
+    return venv_path / "bin"
+
+
+def get_pip_exe(venv_path):
+    """Get the pip executable of a venv"""
+    return get_venv_bin(venv_path) / ("pip.exe" if platform.system() == "Windows" else "pip")
+
+
+def pip_install_command(pip_exe, component_paths, wheel_dir=None):
+    """Build a pip command installing component paths in editable mode
+
+    With ``wheel_dir`` pip resolves everything from that wheelhouse only.
+    """
+    cmd = [str(pip_exe), "install"]
+    if wheel_dir is not None:
+        cmd += ["--no-index", "--find-links", str(wheel_dir)]
+    for path in component_paths:
+        cmd += ["-e", str(path)]
+    return cmd
+
+
+def pip_install_editable(pip_exe, components, install_dir, batch=True, wheel_dir=None):
+    """Install components in editable mode, returning the names that failed
+
+    With ``wheel_dir`` one offline pip run is tried first. With ``batch``
+    all components go to a single pip run so shared dependencies are
+    resolved once. If that run fails, each component is retried on its own
+    to isolate the broken one.
+    """
+    if wheel_dir is not None and components:
+        print(f"Installing {', '.join(components)} from the wheelhouse...")
+        cmd = pip_install_command(pip_exe, [install_dir / c for c in components], wheel_dir)
+        with span("pip install", modules=list(components), offline=True) as step:
+            step.status = subprocess.run(cmd).returncode
+        if step.status == 0:
+            return []
+        print("Wheelhouse install failed, falling back to the package index...")
+    
+    if batch and len(components) > 1:
+        print(f"Installing {', '.join(components)}...")
+        cmd = pip_install_command(pip_exe, [install_dir / c for c in components])
+        with span("pip install", modules=list(components)) as step:
+            step.status = subprocess.run(cmd).returncode
+        if step.status == 0:
+            return []
+        print("Batched install failed, retrying one module at a time...")
+    
+    failed = []
+    for component in components:
+        print(f"Installing {component}...")
+        with span("pip install", component) as step:
+            result = subprocess.run(pip_install_command(pip_exe, [install_dir / component]))
+            step.status = result.returncode
+        if result.returncode != 0:
+            failed.append(component)
+    return failed
+
+
+def ordered_components(modules, install_dir):
+    """List the cloned modules with each one's local dependencies before it"""
+    components = [c for c in modules.keys() if (install_dir / c).exists()]
+    try:
+        return install_order({c: install_dir / c for c in components})
+    except ValueError as exc:
+        print(f"Warning: {exc}; installing in registry order")
+        return components
+
+
+def install_modules(modules, batch=True, wheelhouse=True, template=False,
+                    jobs=DEFAULT_JOBS):
+    """Install zel modules to virtual environment
+
+    Modules are installed with their local dependencies first. With
+    ``wheelhouse`` built wheels are cached under the install dir and
+    reused for later installs, including into fresh venvs; up to ``jobs``
+    independent modules build at once. With ``template`` a missing venv is
+    cloned from a template venv kept under the install dir, and only the
+    modules the clone lacks are installed.
+    """
     install_dir = get_install_dir()
     venv_path = get_venv_path()
+    components = ordered_components(modules, install_dir)
+    sources = {c: install_dir / c for c in components}
     
-    if not venv_path.exists():
-        print(f"Creating zel virtual environment at {venv_path}...")
-        subprocess.run([sys.executable, "-m", "venv", str(venv_path)], check=True)
+    def install(pip_exe, names):
+        wheel_dir = fill_wheelhouse(pip_exe, names, install_dir, jobs) if wheelhouse else None
+        return pip_install_editable(pip_exe, names, install_dir, batch=batch, wheel_dir=wheel_dir)
     
-    if platform.system() == "Windows":
-        python_exe = venv_path / "Scripts" / "python.exe"
-        pip_exe = venv_path / "Scripts" / "pip.exe"
-        bin_path = venv_path / "Scripts"
+    if template and not venv_path.exists() and venv_template.is_supported():
+        template_path = venv_template.get_template_path(install_dir)
+        with span("venv provision", path=str(venv_path), template=str(template_path)):
+            failed = venv_template.provision_venv(venv_path, template_path, sources, install)
     else:
-        python_exe = venv_path / "bin" / "python"
-        pip_exe = venv_path / "bin" / "pip"
-        bin_path = venv_path / "bin"
+        if not venv_path.exists():
+            print(f"Creating zel virtual environment at {venv_path}...")
+            with span("venv create", path=str(venv_path)):
+                subprocess.run([sys.executable, "-m", "venv", str(venv_path)], check=True)
+        
+        print("Installing zel components...")
+        failed = install(get_pip_exe(venv_path), components)
+        venv_template.write_record(venv_path, {c: sources[c] for c in components if c not in failed})
     
-    print("Installing zel components...")
-    for component in modules.keys():
-        component_path = install_dir / component
-        if component_path.exists():
-            print(f"Installing {component}...")
-            subprocess.run([str(pip_exe), "install", "-e", str(component_path)], check=True)
+    finish_install(components, failed, venv_path, install_dir)
+    return not failed
+
+
+def finish_install(components, failed, venv_path, install_dir):
+    """Record an install run and put the venv on PATH"""
+    succeeded = [c for c in components if c not in failed]
+    record_installed(succeeded, install_dir)
+    update_manifest(succeeded, install_dir, INSTALLED)
+    for component in failed:
+        print(f"Failed to install {component}")
+    
+    try:
+        write_completion_cache()
+    except OSError:
+        pass
     
-    add_to_path(bin_path)
-    return True
+    add_to_path(get_venv_bin(venv_path))
+
+
+def get_clone_strategies():
+    """Get the clone strategy recorded for each module"""
+    return read_state_file(resolve_state_file("clones"), {}, strict=False)
+
+
+def clone_command(repo_url, target_dir, depth=None, filter_spec=None, single_branch=False,
+                  reference=None):
+    """Build the git clone command for a clone strategy"""
+    cmd = ["git", "clone"]
+    if depth:
+        cmd += ["--depth", str(depth)]
+    if filter_spec:
+        cmd += [f"--filter={filter_spec}"]
+    if single_branch:
+        cmd += ["--single-branch"]
+    if reference:
+        cmd += ["--reference-if-able", str(reference)]
+    return cmd + [repo_url, str(target_dir)]
+
+
+def record_clone(module_name, install_dir, depth=None, filter_spec=None, single_branch=False,
+                 shared=False):
+    """Record a finished clone's strategy and add it to the manifest"""
+    with state_transaction("clones") as strategies:
+        strategies[module_name] = {
+            "depth": depth,
+            "filter": filter_spec,
+            "single_branch": single_branch,
+            "shared": shared,
+        }
+    update_manifest([module_name], install_dir, CLONED)
 
 
-def clone_module(module_name, repo_url):
-    """Clone a module to the installation directory"""
+def clone_module(module_name, repo_url, depth=None, filter_spec=None, single_branch=False,
+                 shared=False):
+    """Clone a module to the installation directory
+
+    ``depth`` makes a shallow clone, ``filter_spec`` (e.g. ``blob:none``)
+    a partial clone and ``single_branch`` fetches only the default branch.
+    ``shared`` borrows objects from a bare mirror under the install dir so
+    several checkouts store each object once. The strategy is recorded so
+    updates keep using matching fetch options.
+    """
     install_dir = get_install_dir()
     target_dir = install_dir / module_name
     
@@ -106,11 +248,53 @@ def clone_module(module_name, repo_url):
     if target_dir.exists():
         return False, f"Module '{module_name}' already exists at {target_dir}"
     
-    result = subprocess.run([
-        "git", "clone", repo_url, str(target_dir)
-    ], capture_output=True, text=True)
+    reference = None
+    if shared:
+        ok, message = ensure_mirror(install_dir, module_name, repo_url)
+        if not ok:
+            return False, message
+        reference = get_mirror_path(install_dir, module_name)
+    cmd = clone_command(repo_url, target_dir, depth, filter_spec, single_branch, reference)
+    with span("git clone", module_name) as step:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        step.status = result.returncode
     
     if result.returncode == 0:
+        record_clone(module_name, install_dir, depth, filter_spec, single_branch, shared)
         return True, f"Successfully cloned {module_name}"
     else:
-        return False, f"Failed to clone {module_name}: {result.stderr}"
\ No newline at end of file
+        return False, f"Failed to clone {module_name}: {result.stderr}"
+
+
+def clone_modules(module_names, jobs=DEFAULT_JOBS, **strategy):
+    """Clone several modules concurrently
+
+    Modules already present in the install directory are skipped. Returns
+    ``(cloned, skipped, failed)`` in the order the names were given, where
+    ``failed`` holds ``(module, message)`` pairs. Extra keyword arguments are
+    passed to ``clone_module``.
+    """
+    install_dir = get_install_dir()
+    modules = load_modules()
+    
+    skipped = [name for name in module_names if (install_dir / name).exists()]
+    pending = [name for name in module_names if name not in skipped]
+    cloned = []
+    failed = []
+    
+    if not pending:
+        return cloned, skipped, failed
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(pending)))) as pool:
+        futures = [
+            (name, pool.submit(clone_module, name, modules[name]["git_url"], **strategy))
+            for name in pending
+        ]
+        for name, future in futures:
+            success, message = future.result()
+            if success:
+                cloned.append(name)
+            else:
+                failed.append((name, message))
+    
+    return cloned, skipped, failed
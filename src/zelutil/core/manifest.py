@@ -0,0 +1,84 @@
+import re
+import time
+
+from ..utils.state import resolve_state_file, read_state_file, state_transaction
+
+try:
+    import tomllib
+except ImportError:  # Python 3.10
+    tomllib = None
+
+CLONED = "cloned"
+INSTALLED = "installed"
+
+
+def get_manifest_file():
+    """Get the manifest of cloned and installed modules"""
+    return resolve_state_file("installed")
+
+
+def load_manifest():
+    """Load manifest entries keyed by module name"""
+    return read_state_file(get_manifest_file(), {}, strict=False)
+
+
+def read_project_version(module_dir):
+    """Read ``[project].version`` from a module's pyproject.toml, or None"""
+    pyproject = module_dir / "pyproject.toml"
+    if not pyproject.is_file():
+        return None
+    text = pyproject.read_text(encoding="utf-8")
+    if tomllib is not None:
+        try:
+            return tomllib.loads(text).get("project", {}).get("version")
+        except tomllib.TOMLDecodeError:
+            return None
+    match = re.search(r'^version\s*=\s*["\']([^"\']+)["\']', text, re.MULTILINE)
+    return match.group(1) if match else None
+
+
+def update_manifest(names, install_dir, status=None):
+    """Record the current version and commit of modules in the manifest
+
+    ``status`` is ``CLONED`` or ``INSTALLED``; ``None`` keeps each module's
+    existing status. The matching ``cloned_at``/``installed_at`` timestamp
+    is set, and ``updated_at`` is set on every call.
+    """
+    from .fingerprint import get_head_commit
+
+    now = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+    with state_transaction(path=get_manifest_file()) as manifest:
+        for name in names:
+            module_dir = install_dir / name
+            entry = dict(manifest.get(name, {"status": CLONED}))
+            if status is not None:
+                entry["status"] = status
+                entry[f"{status}_at"] = now
+            entry.update({
+                "version": read_project_version(module_dir),
+                "commit": get_head_commit(module_dir),
+                "path": str(module_dir),
+                "updated_at": now,
+            })
+            manifest[name] = entry
+
+
+def scan_install_dir(install_dir, modules):
+    """Rebuild the manifest from what is actually on disk
+
+    Entries whose directory is gone are dropped and new directories are
+    added as cloned. Returns the refreshed manifest.
+    """
+    present = [name for name in modules if (install_dir / name).exists()]
+    known = load_manifest()
+    with state_transaction(path=get_manifest_file()) as manifest:
+        for name in list(manifest):
+            if name not in present:
+                del manifest[name]
+    new = [name for name in present if name not in known]
+    stale = [name for name in present if name in known]
+    if new:
+        update_manifest(new, install_dir, CLONED)
+    if stale:
+        update_manifest(stale, install_dir)
+    return load_manifest()
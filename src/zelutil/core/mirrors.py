@@ -0,0 +1,80 @@
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from . import DEFAULT_JOBS
+from .events import span
+
+
+def get_mirror_dir(install_dir):
+    """Get the directory holding the shared bare mirrors"""
+    return install_dir / "mirrors"
+
+
+def get_mirror_path(install_dir, module_name):
+    """Get the bare mirror used as the object store for a module"""
+    return get_mirror_dir(install_dir) / f"{module_name}.git"
+
+
+# Checkouts borrow objects from the mirror through alternates, so the mirror
+# must never delete an object, even one only a deleted or force-pushed
+# branch pointed at
+NO_GC_CONFIG = ["-c", "gc.auto=0", "-c", "gc.pruneExpire=never"]
+
+
+def mirror_command(install_dir, module_name, repo_url):
+    """Build the git command that creates or refreshes a module's mirror
+
+    Refreshes never prune refs, and garbage collection is switched off in
+    the mirror's config when it is created (and for the refresh itself, to
+    cover mirrors made before that).
+    """
+    mirror = get_mirror_path(install_dir, module_name)
+    if mirror.exists():
+        return ["git", *NO_GC_CONFIG, "--git-dir", str(mirror), "remote", "update"]
+    mirror.parent.mkdir(parents=True, exist_ok=True)
+    return ["git", "clone", "--mirror", *NO_GC_CONFIG, repo_url, str(mirror)]
+
+
+def ensure_mirror(install_dir, module_name, repo_url):
+    """Create or refresh a module's bare mirror, returning (success, message)"""
+    cmd = mirror_command(install_dir, module_name, repo_url)
+    with span("git mirror", module_name) as step:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        step.status = result.returncode
+    if result.returncode == 0:
+        return True, f"Mirror ready for {module_name}"
+    return False, f"Failed to mirror {module_name}: {result.stderr}"
+
+
+def list_mirrors(install_dir):
+    """List modules that have a shared mirror"""
+    mirror_dir = get_mirror_dir(install_dir)
+    if not mirror_dir.exists():
+        return []
+    return sorted(p.name[:-len(".git")] for p in mirror_dir.glob("*.git") if p.is_dir())
+
+
+def refresh_mirrors(install_dir, modules, jobs=DEFAULT_JOBS):
+    """Fetch every existing mirror in one parallel pass
+
+    Returns ``(refreshed, failed)`` where ``failed`` holds
+    ``(module, message)`` pairs.
+    """
+    names = [name for name in list_mirrors(install_dir) if name in modules]
+    refreshed = []
+    failed = []
+    if not names:
+        return refreshed, failed
+
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(names)))) as pool:
+        futures = [
+            (name, pool.submit(ensure_mirror, install_dir, name, modules[name]["git_url"]))
+            for name in names
+        ]
+        for name, future in futures:
+            success, message = future.result()
+            if success:
+                refreshed.append(name)
+            else:
+                failed.append((name, message))
+    return refreshed, failed
@@ -1,11 +1,82 @@
 import json
+import os
+import sys
 from functools import lru_cache
 from importlib import resources
+from pathlib import Path
 
+from ..utils import daemon
+from ..utils.state import resolve_state_dir, write_state_file
 
-@lru_cache(maxsize=1)
-def load_modules():
-    """Load module configuration bundled with the package"""
+INDEX_VERSION = 1
+
+
+def get_registry_dirs():
+    """Get overlay registry directories, lowest precedence first"""
+    if os.name == "nt":
+        site_dir = Path(os.environ.get("PROGRAMDATA", r"C:\ProgramData")) / "zel" / "modules.d"
+    else:
+        site_dir = Path("/etc/zel/modules.d")
+    return [site_dir, resolve_state_dir() / "modules.d"]
+
+
+def get_index_file():
+    """Get the precompiled registry index in the state dir"""
+    return resolve_state_dir() / "modules-index.json"
+
+
+def _bundled_registry():
+    """Get the bundled registry as a filesystem path, or None if not on disk"""
+    try:
+        path = resources.files("zelutil.data").joinpath("zel-modules.json")
+    except ModuleNotFoundError:
+        return None
+    return Path(str(path)) if isinstance(path, Path) else None
+
+
+def _signature(paths):
+    """Stat each path into [path, mtime_ns, size], using None for missing paths"""
+    signature = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            signature.append([str(path), st.st_mtime_ns, st.st_size])
+        except OSError:
+            signature.append([str(path), None, None])
+    return signature
+
+
+def _valid_modules(data, source):
+    """Return the well-formed module entries of a parsed registry
+
+    A registry that is not ``{"modules": {name: {...}}}`` is ignored, as is
+    any entry that is not an object, with a warning naming ``source``.
+    """
+    modules = data.get("modules", {}) if isinstance(data, dict) else None
+    if not isinstance(modules, dict):
+        print(f"Ignoring {source}: \"modules\" is not an object", file=sys.stderr)
+        return {}
+    valid = {}
+    for name, info in modules.items():
+        if isinstance(info, dict):
+            valid[name] = info
+        else:
+            print(f"Ignoring module {name} in {source}: entry is not an object", file=sys.stderr)
+    return valid
+
+
+def _read_registry(path):
+    """Read the modules of one registry file, ignoring unreadable files"""
+    try:
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return _valid_modules(data, path)
+
+
+def _read_bundled_registry():
+    """Read the bundled registry through importlib.resources"""
     try:
         with resources.open_text("zelutil.data", "zel-modules.json", encoding="utf-8") as fh:
             data = json.load(fh)
@@ -14,7 +85,87 @@ def load_modules():
     except json.JSONDecodeError:
         return {}
     
-    return data.get("modules", {})
+    return _valid_modules(data, "the bundled registry")
+
+
+def compile_registry():
+    """Merge the bundled registry with site and user overlays
+
+    Overlays are ``*.json`` files in each of ``get_registry_dirs()`` with
+    the same ``{"modules": {...}}`` layout; their fields override the
+    bundled entry of the same name. Returns ``(modules, sources)`` where
+    ``sources`` is the stat signature of every file and directory the
+    result depends on, taken before each one is read.
+    """
+    sources = _signature([_bundled_registry()]) if _bundled_registry() else []
+    modules = _read_bundled_registry()
+    
+    for registry_dir in get_registry_dirs():
+        sources += _signature([registry_dir])
+        if not registry_dir.is_dir():
+            continue
+        for overlay in sorted(registry_dir.glob("*.json")):
+            sources += _signature([overlay])
+            for name, info in _read_registry(overlay).items():
+                modules[name] = {**modules.get(name, {}), **info}
+    
+    return modules, sources
+
+
+def sources_current(sources):
+    """Check that every file and directory in a stat signature is unchanged"""
+    return bool(sources) and _signature(path for path, _, _ in sources) == sources
+
+
+def _load_index():
+    """Load the compiled index if every source it was built from is unchanged"""
+    try:
+        with open(get_index_file(), encoding="utf-8") as fh:
+            index = json.load(fh)
+    except (OSError, json.JSONDecodeError):
+        return None
+    
+    if index.get("version") != INDEX_VERSION:
+        return None
+    if not sources_current(index.get("sources", [])):
+        return None
+    return index.get("modules", {})
+
+
+def rebuild_index():
+    """Recompile the merged registry and write it to the index file"""
+    modules, sources = compile_registry()
+    if _bundled_registry() is not None:
+        try:
+            write_state_file(get_index_file(), {
+                "version": INDEX_VERSION,
+                "sources": sources,
+                "modules": modules,
+            })
+        except OSError:
+            pass
+        from .completion import refresh_completion_cache
+        try:
+            refresh_completion_cache(modules)
+        except OSError:
+            pass
+    return modules
+
+
+@lru_cache(maxsize=1)
+def load_modules():
+    """Load the merged module registry, using the compiled index when current
+
+    A running daemon's copy is used when every source it was compiled
+    from is unchanged.
+    """
+    ok, reply = daemon.request("modules")
+    if ok and sources_current(reply["sources"]):
+        return reply["modules"]
+    modules = _load_index()
+    if modules is None:
+        modules = rebuild_index()
+    return modules
 
 
 def get_module_names():
@@ -0,0 +1,119 @@
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+
+from ..utils import daemon
+from ..utils.state import resolve_state_dir, read_state_file_signed
+
+
+def _read(path):
+    """Read a state file through the mtime-validated cache, with its signature"""
+    signature, data = read_state_file_signed(path)
+    return {"signature": signature, "data": data if signature is not None else {}}
+
+
+def _config(app_name=None):
+    state_dir = resolve_state_dir()
+    return _read(state_dir / app_name / "config.json" if app_name else state_dir / "config.json")
+
+
+def _installed_apps(installed_only=False):
+    from ..utils.integration import get_installed_apps
+    return get_installed_apps(installed_only=installed_only)
+
+
+# Merged registry held between requests, with the sources it was compiled from
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def _modules():
+    from .registry import compile_registry, sources_current
+    global _registry
+    with _registry_lock:
+        if _registry is None or not sources_current(_registry["sources"]):
+            modules, sources = compile_registry()
+            _registry = {"sources": sources, "modules": modules}
+        return _registry
+
+
+# Operations the daemon answers; each returns JSON-serialisable data
+OPERATIONS = {
+    "ping": lambda: "pong",
+    "paths": lambda: _read(resolve_state_dir() / "paths.json"),
+    "config": _config,
+    "installed_apps": _installed_apps,
+    "modules": _modules,
+}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                message = json.loads(line)
+                result = OPERATIONS[message["op"]](**message.get("args", {}))
+                reply = {"ok": True, "result": result}
+            except Exception as exc:
+                reply = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+            self.wfile.write(json.dumps(reply).encode() + b"\n")
+            self.wfile.flush()
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def _is_running(path):
+    """Check whether another daemon answers on ``path``"""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(1.0)
+            sock.connect(str(path))
+        return True
+    except OSError:
+        return False
+
+
+def serve(socket_path=None, on_ready=None):
+    """Serve resolved state over a Unix socket until interrupted
+
+    Paths, configs and the registry are held in memory and re-validated
+    against file mtimes on every request, so edits made by other tools are
+    picked up without restarting.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise RuntimeError("Unix domain sockets are not supported on this platform")
+
+    path = socket_path or daemon.get_socket_path()
+    if os.path.exists(path):
+        if _is_running(path):
+            raise RuntimeError(f"A zelutil daemon is already listening on {path}")
+        os.unlink(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    daemon._disabled = True
+    old_umask = os.umask(0o177)
+    try:
+        server = _Server(str(path), _Handler)
+    finally:
+        os.umask(old_umask)
+
+    if threading.current_thread() is threading.main_thread():
+        # Turn SIGTERM into a normal exit so the socket file is removed
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    try:
+        if on_ready:
+            on_ready(path)
+        server.serve_forever()
+    finally:
+        server.server_close()
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,233 @@
+import copy
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from ..utils.state import resolve_state_dir, read_state_file, write_state_file
+from ..utils.storage import item_day
+from ..utils.stream import iter_json_items
+from . import DEFAULT_JOBS
+
+INDEX_VERSION = 2
+
+# Collections that describe activity on a given day
+SUMMARY_COLLECTIONS = ("active", "completed")
+
+# Item fields used as a label in summaries, in order of preference
+LABEL_FIELDS = ("title", "name", "description", "text")
+
+
+def get_index_dir():
+    """Get the directory holding the per-app summary indexes"""
+    return resolve_state_dir() / "summary-index"
+
+
+def find_data_apps():
+    """List apps in the state dir that keep active/completed data"""
+    state_dir = resolve_state_dir()
+    if not state_dir.is_dir():
+        return []
+    apps = []
+    for entry in sorted(os.scandir(state_dir), key=lambda e: e.name):
+        if not entry.is_dir() or entry.name.startswith("."):
+            continue
+        names = set(os.listdir(entry.path))
+        if "storage.db" in names or any(
+            f"{c}.json" in names or f"{c}.jsonl" in names for c in SUMMARY_COLLECTIONS
+        ):
+            apps.append(entry.name)
+    return apps
+
+
+def _item_label(item):
+    for field in LABEL_FIELDS:
+        if isinstance(item.get(field), str):
+            return item[field]
+    return str(item.get("id", ""))
+
+
+def _count_items(days, items):
+    """Count items per day from ``(offset, item)`` pairs
+
+    Each day also keeps the offset of its first item when ``offset`` is
+    not None, so labels can later be read without scanning from the start.
+    """
+    for offset, item in items:
+        if not isinstance(item, dict):
+            continue
+        day = item_day(item)
+        if day is None:
+            continue
+        entry = days.get(day)
+        if entry is None:
+            entry = days[day] = {"count": 0} if offset is None else {"count": 0, "offset": offset}
+        entry["count"] += 1
+
+
+def _iter_jsonl(path, start, end):
+    """Yield ``(offset, item)`` for the complete lines of a JSON-lines file between two offsets"""
+    with open(path, "rb") as f:
+        f.seek(start)
+        pos = start
+        while pos < end:
+            line = f.readline()
+            if not line:
+                break
+            offset = pos
+            pos += len(line)
+            try:
+                yield offset, json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def _jsonl_end(path, size):
+    """Offset just past the last complete line, so a torn append is re-read later"""
+    with open(path, "rb") as f:
+        f.seek(max(0, size - 1))
+        if f.read(1) == b"\n":
+            return size
+    data = path.read_bytes()[:size]
+    return data.rfind(b"\n") + 1
+
+
+def _index_source(path, old):
+    """Build the index entry for one data file, reusing ``old`` when possible
+
+    Only per-day counts are kept (plus, for JSON-lines logs, where each
+    day starts), so the index stays small however many items there are.
+    Unchanged files are kept as they are. A JSON-lines log that only grew
+    is read from where the last run stopped; anything else is re-read.
+    """
+    st = os.stat(path)
+    signature = [st.st_ino, st.st_mtime_ns, st.st_size]
+    if old and old.get("signature") == signature:
+        return old
+
+    if path.suffix == ".jsonl":
+        # Same inode and no shrink means the log was only appended to
+        resume = old and old["signature"][0] == st.st_ino and old["offset"] <= st.st_size
+        days = copy.deepcopy(old["days"]) if resume else {}
+        offset = old["offset"] if resume else 0
+        end = _jsonl_end(path, st.st_size)
+        _count_items(days, _iter_jsonl(path, offset, end))
+        return {"signature": signature, "offset": end, "days": days}
+
+    days = {}
+    try:
+        _count_items(days, ((None, item) for item in iter_json_items(path)))
+    except (ValueError, json.JSONDecodeError):
+        pass
+    return {"signature": signature, "days": days}
+
+
+def update_app_index(app_name):
+    """Bring one app's date index up to date and return it"""
+    app_dir = resolve_state_dir() / app_name
+    index_file = get_index_dir() / f"{app_name}.json"
+    index = read_state_file(index_file, {}, strict=False)
+    if index.get("version") != INDEX_VERSION:
+        index = {}
+    old_sources = index.get("sources", {})
+
+    sources = {}
+    for collection in SUMMARY_COLLECTIONS:
+        # An append-only log takes precedence over the legacy file it may emit
+        for name in (f"{collection}.jsonl", f"{collection}.json"):
+            path = app_dir / name
+            if not path.exists():
+                continue
+            old = old_sources.get(collection)
+            if old is not None and old.get("file") != name:
+                old = None
+            sources[collection] = {"file": name, **_index_source(path, old)}
+            break
+
+    new_index = {"version": INDEX_VERSION, "sources": sources}
+    if new_index != index:
+        write_state_file(index_file, new_index)
+    return new_index
+
+
+def _read_labels(path, source, since, until):
+    """Read the labels of the items dated in ``[since, until]`` from one data file"""
+    if path.suffix == ".jsonl":
+        offsets = [e["offset"] for day, e in source["days"].items() if since <= day <= until]
+        if not offsets:
+            return {}
+        items = (item for _, item in _iter_jsonl(path, min(offsets), source["offset"]))
+    else:
+        items = iter_json_items(path)
+
+    labels = {}
+    try:
+        for item in items:
+            day = item_day(item) if isinstance(item, dict) else None
+            if day is not None and since <= day <= until:
+                labels.setdefault(day, []).append(_item_label(item))
+    except (ValueError, json.JSONDecodeError):
+        pass
+    return labels
+
+
+def _file_days(app_name, since, until, labels):
+    """Summarize an app's data files through its date index"""
+    app_dir = resolve_state_dir() / app_name
+    result = {}
+    for collection, source in update_app_index(app_name)["sources"].items():
+        days = {day: {"count": entry["count"]} for day, entry in source["days"].items()
+                if since <= day <= until}
+        if labels and days:
+            day_labels = _read_labels(app_dir / source["file"], source, since, until)
+            for day, entry in days.items():
+                entry["labels"] = day_labels.get(day, [])
+        result[collection] = days
+    return result
+
+
+def _storage_days(app_name, since, until, labels):
+    """Summarize an app that uses SQLite storage straight from its day index"""
+    from ..utils.storage import AppStorage
+
+    result = {}
+    with AppStorage(app_name) as storage:
+        for collection in SUMMARY_COLLECTIONS:
+            days = {day: {"count": count}
+                    for day, count in storage.day_counts(collection, since, until).items()}
+            if labels and days:
+                for item in storage.items(collection, since=since, until=until):
+                    day = item_day(item, storage.date_fields)
+                    if day in days:
+                        days[day].setdefault("labels", []).append(_item_label(item))
+            result[collection] = days
+    return result
+
+
+def summarize(since, until, apps=None, jobs=DEFAULT_JOBS, labels=False):
+    """Summarize activity per day and app for days in ``[since, until]``
+
+    Returns ``{day: {app: {collection: {"count": n}}}}`` with days in
+    ascending order; with ``labels`` each entry also lists its items'
+    labels under ``"labels"``. Apps are indexed in parallel and only data
+    files changed since the last run are read. Labels are not indexed, so
+    asking for them reads the items of the requested days. Apps that
+    migrated to SQLite storage are queried through its day index instead.
+    """
+    apps = find_data_apps() if apps is None else list(apps)
+    summary = {}
+    if not apps:
+        return summary
+
+    def summarize_app(app_name):
+        if (resolve_state_dir() / app_name / "storage.db").exists():
+            return _storage_days(app_name, since, until, labels)
+        return _file_days(app_name, since, until, labels)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(apps)))) as pool:
+        results = list(zip(apps, pool.map(summarize_app, apps)))
+
+    for app_name, collections in results:
+        for collection, days in collections.items():
+            for day, entry in days.items():
+                summary.setdefault(day, {}).setdefault(app_name, {})[collection] = entry
+    return dict(sorted(summary.items()))
@@ -1,31 +1,254 @@
 import subprocess
-from .installer import get_install_dir
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ..utils.state import resolve_state_file, read_state_file, state_transaction
+from . import DEFAULT_JOBS
+from .events import span
+from .installer import get_clone_strategies, get_install_dir
+from .manifest import update_manifest
+from .mirrors import ensure_mirror
 from .registry import load_modules
 
+# How a module's HEAD relates to its fetched upstream
+CURRENT = "current"
+BEHIND = "behind"
+AHEAD = "ahead"
+DIVERGED = "diverged"
+
+# Applied updates kept in the ledger history
+LEDGER_HISTORY = 200
+
+# Partial-clone filters and single-branch refspecs persist in each repo's
+# git config, so fetching never needs the clone strategy. A shallow clone's
+# depth is deliberately not repeated: --depth would cut the new upstream tip
+# off from HEAD, making a plain fast-forward look like divergence, while a
+# plain fetch only grows the history down to the existing shallow boundary.
+FETCH_COMMAND = ["git", "fetch", "--quiet"]
+
+# Resolves HEAD and its upstream branch, one commit per line
+UPSTREAM_COMMAND = ["git", "rev-parse", "HEAD", "@{upstream}"]
+
+DIVERGED_MESSAGE = "local branch has diverged from upstream; not fast-forwarding"
+
+
+def get_ledger_file():
+    """Get the ledger of planned and applied module updates"""
+    return resolve_state_file("update-ledger")
+
+
+def load_ledger():
+    """Load the update ledger"""
+    return read_state_file(get_ledger_file(), {}, strict=False)
+
+
+def fetch_module(module_dir, strategy=None, repo_url=None):
+    """Run git fetch in a module directory, returning (returncode, stderr, seconds)
+
+    Only remote-tracking refs move; the working tree is left alone. Of
+    the recorded clone ``strategy`` only ``shared`` is used: modules cloned
+    against a shared mirror refresh the mirror first so the fetch itself
+    only has to transfer refs.
+    """
+    start = time.perf_counter()
+    if strategy and strategy.get("shared") and repo_url:
+        ok, message = ensure_mirror(module_dir.parent, module_dir.name, repo_url)
+        if not ok:
+            return 1, message, time.perf_counter() - start
+    with span("git fetch", module_dir.name) as step:
+        result = subprocess.run(
+            FETCH_COMMAND,
+            cwd=module_dir,
+            capture_output=True,
+            text=True
+        )
+        step.status = result.returncode
+    return result.returncode, result.stderr, time.perf_counter() - start
+
+
+def _git(module_dir, cmd):
+    return subprocess.run(cmd, cwd=module_dir, capture_output=True, text=True)
 
-def update_modules():
-    """Update all installed zel modules"""
+
+def parse_upstream(returncode, stdout, stderr):
+    """Read ``(head, upstream)`` from the output of ``UPSTREAM_COMMAND``
+
+    Raises ``RuntimeError`` if the checkout has no upstream branch.
+    """
+    if returncode != 0:
+        raise RuntimeError(stderr.strip() or "no upstream branch")
+    head, upstream = stdout.split()
+    return head, upstream
+
+
+def ancestor_command(ancestor, descendant):
+    """Build the git command that succeeds if ``ancestor`` is an ancestor of ``descendant``"""
+    return ["git", "merge-base", "--is-ancestor", ancestor, descendant]
+
+
+def compare_upstream(module_dir):
+    """Compare HEAD with the fetched upstream ref
+
+    Returns ``(status, head, upstream)`` where ``status`` is one of
+    ``CURRENT``, ``BEHIND``, ``AHEAD`` or ``DIVERGED``. Raises
+    ``RuntimeError`` if the checkout has no upstream branch.
+    """
+    result = _git(module_dir, UPSTREAM_COMMAND)
+    head, upstream = parse_upstream(result.returncode, result.stdout, result.stderr)
+    if head == upstream:
+        return CURRENT, head, upstream
+    if _git(module_dir, ancestor_command(head, upstream)).returncode == 0:
+        return BEHIND, head, upstream
+    if _git(module_dir, ancestor_command(upstream, head)).returncode == 0:
+        return AHEAD, head, upstream
+    return DIVERGED, head, upstream
+
+
+def update_targets():
+    """Find the cloned modules to check for updates
+
+    Returns ``(install_dir, modules, present, strategies)`` where ``present``
+    lists the cloned modules in registry order, or None when no modules
+    are configured.
+    """
     install_dir = get_install_dir()
     modules = load_modules()
-    
     if not modules:
-        return [], [], "No modules configured"
-    
-    updated = []
+        return None
+    present = [m for m in modules.keys() if (install_dir / m).exists()]
+    return install_dir, modules, present, get_clone_strategies()
+
+
+def collect_plan(present, results, timings=None):
+    """Turn per-module ``(elapsed, comparison, error)`` results into ``(plan, failed)``"""
+    plan = {}
     failed = []
-    
-    for module in modules.keys():
+    for module, (elapsed, comparison, error) in zip(present, results):
+        if timings is not None:
+            timings[module] = elapsed
+        if comparison is None:
+            failed.append((module, error))
+            continue
+        status, head, upstream = comparison
+        plan[module] = {"status": status, "from": head, "to": upstream}
+    return plan, failed
+
+
+def plan_updates(jobs=DEFAULT_JOBS, timings=None):
+    """Fetch every cloned module and work out which ones can fast-forward
+
+    Fetches run in a pool of at most ``jobs`` threads. Returns
+    ``(plan, failed, error)`` where ``plan`` maps modules, in registry order,
+    to ``{"status", "from", "to"}`` and ``failed`` holds ``(module, message)``
+    pairs. The plan is written to the ledger; no working tree is touched.
+    If ``timings`` is a dict it is filled with each module's fetch time.
+    """
+    targets = update_targets()
+    if targets is None:
+        return {}, [], "No modules configured"
+    install_dir, modules, present, strategies = targets
+    if not present:
+        return {}, [], None
+
+    def check(module):
         module_dir = install_dir / module
-        if module_dir.exists():
-            result = subprocess.run(
-                ["git", "pull"], 
-                cwd=module_dir, 
-                capture_output=True, 
-                text=True
-            )
-            if result.returncode == 0:
-                updated.append(module)
-            else:
-                failed.append((module, result.stderr))
-    
-    return updated, failed, None
\ No newline at end of file
+        returncode, stderr, elapsed = fetch_module(module_dir, strategies.get(module),
+                                                   modules[module].get("git_url"))
+        if returncode != 0:
+            return elapsed, None, stderr
+        try:
+            return elapsed, compare_upstream(module_dir), None
+        except RuntimeError as exc:
+            return elapsed, None, str(exc)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(present)))) as pool:
+        results = list(pool.map(check, present))
+
+    plan, failed = collect_plan(present, results, timings)
+    record_plan(plan)
+    return plan, failed, None
+
+
+def record_plan(plan):
+    """Write each module's planned old→new commits to the ledger"""
+    now = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+    with state_transaction(path=get_ledger_file()) as ledger:
+        checked = dict(ledger.get("modules", {}))
+        for module, entry in plan.items():
+            checked[module] = {**entry, "checked_at": now}
+        ledger["modules"] = checked
+        ledger["checked_at"] = now
+
+
+def merge_command(entry):
+    """Build the git command fast-forwarding a module to its planned commit"""
+    return ["git", "merge", "--ff-only", "--quiet", entry["to"]]
+
+
+def apply_updates(plan, install_dir):
+    """Fast-forward the modules a plan marks as behind
+
+    Returns ``(updated, failed)``. Each fast-forward is appended to the
+    ledger history as an old→new commit pair.
+    """
+    updated = []
+    failed = []
+    for module, entry in plan.items():
+        if entry["status"] != BEHIND:
+            continue
+        with span("git merge", module) as step:
+            result = _git(install_dir / module, merge_command(entry))
+            step.status = result.returncode
+        if result.returncode == 0:
+            updated.append(module)
+        else:
+            failed.append((module, result.stderr))
+
+    record_applied(plan, updated, install_dir)
+    return updated, failed
+
+
+def record_applied(plan, updated, install_dir):
+    """Write the modules just fast-forwarded to the ledger and manifest"""
+    now = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+    with state_transaction(path=get_ledger_file()) as ledger:
+        checked = dict(ledger.get("modules", {}))
+        history = list(ledger.get("history", []))
+        for module in updated:
+            entry = plan[module]
+            history.append({"module": module, "from": entry["from"], "to": entry["to"],
+                            "updated_at": now})
+            checked[module] = {"status": CURRENT, "from": entry["to"], "to": entry["to"],
+                               "checked_at": now}
+        ledger["modules"] = checked
+        ledger["history"] = history[-LEDGER_HISTORY:]
+
+    if updated:
+        update_manifest(updated, install_dir)
+
+
+def diverged_failures(plan):
+    """Report the modules a plan leaves alone because they have diverged"""
+    return [(module, DIVERGED_MESSAGE) for module, entry in plan.items()
+            if entry["status"] == DIVERGED]
+
+
+def update_modules(jobs=DEFAULT_JOBS, timings=None, plan=None):
+    """Update all installed zel modules
+
+    Fetches every module, then fast-forwards those that are behind. Results
+    keep registry order. If ``timings`` is a dict it is filled with each
+    module's fetch time; if ``plan`` is a dict it is filled with the plan
+    from ``plan_updates``. Modules that have diverged are reported as
+    failed rather than merged; modules ahead of upstream are left alone.
+    """
+    planned, failed, error = plan_updates(jobs=jobs, timings=timings)
+    if error:
+        return [], [], error
+    if plan is not None:
+        plan.update(planned)
+
+    install_dir = get_install_dir()
+    updated, apply_failed = apply_updates(planned, install_dir)
+    failed += apply_failed + diverged_failures(planned)
+    return updated, failed, None
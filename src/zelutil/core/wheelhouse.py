@@ -0,0 +1,127 @@
+import re
+import subprocess
+
+from ..utils.build_plan import build_wheels
+from ..utils.state import read_state_file, state_transaction
+from . import DEFAULT_JOBS
+from .events import span
+from .fingerprint import build_fingerprint, get_head_commit
+
+try:
+    import tomllib
+except ImportError:  # Python 3.10
+    tomllib = None
+
+# PEP 518 default for projects without a [build-system] table
+DEFAULT_BUILD_REQUIRES = ["setuptools>=40.8.0", "wheel"]
+
+
+def get_wheelhouse_dir(install_dir):
+    """Get the directory holding cached module and dependency wheels"""
+    return install_dir / "wheelhouse"
+
+
+def get_wheelhouse_index(install_dir):
+    """Get the file recording which module builds the wheelhouse covers"""
+    return get_wheelhouse_dir(install_dir) / "index.json"
+
+
+def read_build_requires(module_dir):
+    """Read ``[build-system].requires`` from a module's pyproject.toml"""
+    pyproject = module_dir / "pyproject.toml"
+    if not pyproject.is_file():
+        return list(DEFAULT_BUILD_REQUIRES)
+    text = pyproject.read_text(encoding="utf-8")
+    if tomllib is not None:
+        try:
+            build_system = tomllib.loads(text).get("build-system", {})
+        except tomllib.TOMLDecodeError:
+            return list(DEFAULT_BUILD_REQUIRES)
+        return list(build_system.get("requires", DEFAULT_BUILD_REQUIRES))
+    match = re.search(r'^\[build-system\][^\[]*?^requires\s*=\s*\[([^\]]*)\]', text,
+                      re.MULTILINE | re.DOTALL)
+    if not match:
+        return list(DEFAULT_BUILD_REQUIRES)
+    return re.findall(r'["\']([^"\']+)["\']', match.group(1))
+
+
+def stale_modules(components, install_dir):
+    """Return the components whose current build files are not in the wheelhouse
+
+    Entries are keyed by build fingerprint, so a new commit that leaves
+    the build files alone still counts as covered.
+    """
+    index = read_state_file(get_wheelhouse_index(install_dir), {}, strict=False)
+    return [
+        c for c in components
+        if index.get(c, {}).get("build") != build_fingerprint(install_dir / c)
+    ]
+
+
+def wheel_command(pip_exe, wheel_dir, requirements):
+    """Build a pip command that stores wheels for requirements and their dependencies"""
+    cmd = [str(pip_exe), "wheel", "--wheel-dir", str(wheel_dir), "--find-links", str(wheel_dir)]
+    return cmd + list(requirements)
+
+
+def _run_build(name, cmd):
+    with span("pip wheel", name) as step:
+        step.status = subprocess.run(cmd, capture_output=True, text=True).returncode
+    return step.status
+
+
+def plan_wheelhouse(components, install_dir):
+    """Work out what ``fill_wheelhouse`` has to build
+
+    Returns ``(wheel_dir, stale, requirements)``: the components missing
+    from the wheelhouse and the build requirements they need between them.
+    The wheelhouse directory is created when anything is stale.
+    """
+    wheel_dir = get_wheelhouse_dir(install_dir)
+    stale = stale_modules(components, install_dir)
+    requirements = []
+    for component in stale:
+        for requirement in read_build_requires(install_dir / component):
+            if requirement not in requirements:
+                requirements.append(requirement)
+    if stale:
+        wheel_dir.mkdir(parents=True, exist_ok=True)
+        print(f"Building wheels for {', '.join(stale)}...")
+    return wheel_dir, stale, requirements
+
+
+def record_wheelhouse(stale, failed, install_dir):
+    """Index the stale components that built, returning the wheelhouse or None on failure"""
+    built = [c for c in stale if c not in failed]
+    with state_transaction(path=get_wheelhouse_index(install_dir)) as index:
+        for component in built:
+            module_dir = install_dir / component
+            index[component] = {
+                "commit": get_head_commit(module_dir),
+                "build": build_fingerprint(module_dir),
+            }
+    if failed:
+        print("Could not fill the wheelhouse, installing from the package index")
+        return None
+    return get_wheelhouse_dir(install_dir)
+
+
+def fill_wheelhouse(pip_exe, components, install_dir, jobs=DEFAULT_JOBS):
+    """Build wheels for components missing from the wheelhouse
+
+    Module wheels, their third-party dependencies and the packages needed to
+    build them are stored together, so a later ``--no-index`` install can
+    run offline. Modules build in dependency order, with up to ``jobs``
+    independent modules at once. Returns the wheelhouse directory, or None
+    if it could not be filled.
+    """
+    wheel_dir, stale, requirements = plan_wheelhouse(components, install_dir)
+    if not stale:
+        return wheel_dir
+
+    if requirements and _run_build(None, wheel_command(pip_exe, wheel_dir, requirements)) != 0:
+        failed = stale
+    else:
+        failed = build_wheels(pip_exe, {c: install_dir / c for c in stale}, wheel_dir,
+                              jobs=jobs, run=_run_build)
+    return record_wheelhouse(stale, failed, install_dir)
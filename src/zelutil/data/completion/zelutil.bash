@@ -0,0 +1,40 @@
+# bash completion for zelutil
+#
+# Reads the static cache written by `zelutil completion --refresh` instead of
+# running zelutil, so completing costs no Python startup.
+# Install: zelutil completion bash > ~/.local/share/bash-completion/completions/zelutil
+
+_zelutil_complete() {
+    local cache="$HOME/.local/state/zel/completion.cache"
+    [[ -r $cache ]] || return 0
+
+    local -A cmds opts args lists
+    local kind key rest
+    while read -r kind key rest; do
+        case $kind in
+            cmd) cmds[$key]=$rest ;;
+            opt) opts[$key]=$rest ;;
+            arg) args[$key]=$rest ;;
+            words) lists[$key]=$rest ;;
+        esac
+    done < "$cache"
+
+    local cur=${COMP_WORDS[COMP_CWORD]} node=zelutil word i
+    for ((i = 1; i < COMP_CWORD; i++)); do
+        word=${COMP_WORDS[i]}
+        [[ $word == -* ]] && continue
+        [[ " ${cmds[$node]} " == *" $word "* ]] && node=$node:$word
+    done
+
+    local candidates=
+    if [[ $cur == -* ]]; then
+        candidates=${opts[$node]}
+    elif [[ -n ${cmds[$node]} ]]; then
+        candidates=${cmds[$node]}
+    elif [[ -n ${args[$node]} ]]; then
+        candidates=${lists[${args[$node]}]}
+    fi
+    COMPREPLY=($(compgen -W "$candidates" -- "$cur"))
+}
+
+complete -o default -F _zelutil_complete zelutil
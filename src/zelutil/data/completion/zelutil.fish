@@ -0,0 +1,53 @@
+# fish completion for zelutil
+#
+# Reads the static cache written by `zelutil completion --refresh` instead of
+# running zelutil, so completing costs no Python startup.
+# Install: zelutil completion fish > ~/.config/fish/completions/zelutil.fish
+
+function __zelutil_lookup --description 'Print the words of a cache entry'
+    set -l kind $argv[1]
+    set -l key $argv[2]
+    for line in $argv[3..-1]
+        set -l parts (string split ' ' -- $line)
+        if test "$parts[1]" = $kind -a "$parts[2]" = $key
+            printf '%s\n' $parts[3..-1]
+            return
+        end
+    end
+end
+
+function __zelutil_complete
+    set -l cache $HOME/.local/state/zel/completion.cache
+    test -r $cache; or return
+
+    set -l lines
+    while read -l line
+        set -a lines $line
+    end < $cache
+
+    set -l tokens (commandline -opc)
+    set -l current (commandline -ct)
+    set -l node zelutil
+    for token in $tokens[2..-1]
+        string match -q -- '-*' $token; and continue
+        if contains -- $token (__zelutil_lookup cmd $node $lines)
+            set node $node:$token
+        end
+    end
+
+    if string match -q -- '-*' $current
+        __zelutil_lookup opt $node $lines
+        return
+    end
+    set -l subcommands (__zelutil_lookup cmd $node $lines)
+    if test (count $subcommands) -gt 0
+        printf '%s\n' $subcommands
+        return
+    end
+    set -l list (__zelutil_lookup arg $node $lines)
+    if test -n "$list"
+        __zelutil_lookup words $list $lines
+    end
+end
+
+complete -c zelutil -a '(__zelutil_complete)'
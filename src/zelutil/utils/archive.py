@@ -0,0 +1,134 @@
+"""Append-only JSON-lines archive for completed items."""
+import json
+import os
+from pathlib import Path
+
+from .state import resolve_state_dir, atomic_write, file_lock, write_state_file
+
+
+class ItemLog:
+    """Append-only log of items in ``<state_dir>/<app>/<collection>.jsonl``.
+
+    Appending writes one line, so it costs the same however long the
+    history is. Writers serialise on an advisory lock so lines from
+    concurrent processes never interleave and compaction never drops an
+    append. Readers stream the file and skip a torn trailing line.
+    """
+
+    def __init__(self, app_name, collection="completed", path=None):
+        if path is None:
+            path = resolve_state_dir() / app_name / f"{collection}.jsonl"
+        self.app_name = app_name
+        self.collection = collection
+        self.path = Path(path)
+
+    def append(self, item):
+        """Append one item to the log"""
+        self.append_many([item])
+
+    def append_many(self, items):
+        """Append several items with a single write"""
+        data = "".join(json.dumps(item, separators=(",", ":")) + "\n" for item in items)
+        if not data:
+            return
+        with file_lock(self.path):
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, data.encode("utf-8"))
+            finally:
+                os.close(fd)
+
+    def __iter__(self):
+        return self.items()
+
+    def items(self, start=0):
+        """Yield items one at a time in the order they were appended
+
+        ``start`` is a byte offset at the beginning of a line, such as one
+        returned by ``offset_of_day``.
+        """
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            f.seek(start)
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    def offset_of_day(self, day):
+        """Find the offset of the first line dated on or after ``day``
+
+        The log must be in ascending date order. Bisects the file on line
+        boundaries, so only a few lines are read however long the log is.
+        Undated and torn lines are stepped over.
+        """
+        from .storage import item_day
+
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return 0
+        with f:
+            lo, hi = 0, os.fstat(f.fileno()).st_size
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if mid > lo:
+                    # Step to the first line starting at or after mid
+                    f.seek(mid - 1)
+                    f.readline()
+                else:
+                    f.seek(mid)
+                found = None
+                while f.tell() < hi:
+                    line = f.readline()
+                    try:
+                        item = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    found = item_day(item) if isinstance(item, dict) else None
+                    if found is not None:
+                        break
+                if found is not None and found < day:
+                    lo = f.tell()
+                else:
+                    hi = mid
+            return lo
+
+    def import_json(self, json_file=None):
+        """Append the items of a legacy ``<collection>.json`` file, returning how many"""
+        from .storage import _json_items
+
+        json_file = Path(json_file) if json_file else self.path.with_suffix(".json")
+        with open(json_file, encoding="utf-8") as f:
+            items = _json_items(json.load(f))
+        self.append_many(items)
+        return len(items)
+
+    def compact(self, legacy_json=False):
+        """Rewrite the log without blank or torn lines and with one entry per id
+
+        When an ``id`` appears more than once the last entry wins but keeps
+        the position of the first. With ``legacy_json`` the result is also
+        written as ``<collection>.json`` for readers of the old format.
+        Returns the number of items kept.
+        """
+        with file_lock(self.path):
+            items = {}
+            for index, item in enumerate(self.items()):
+                key = item.get("id", f"\0{index}") if isinstance(item, dict) else f"\0{index}"
+                items[key] = item
+            kept = list(items.values())
+
+            with atomic_write(self.path) as f:
+                for item in kept:
+                    f.write(json.dumps(item, separators=(",", ":")) + "\n")
+
+            if legacy_json:
+                write_state_file(self.path.with_suffix(".json"), kept)
+        return len(kept)
@@ -0,0 +1,168 @@
+"""Dependency-ordered build and install planning for local modules.
+
+Like ``venv_template`` this only uses the standard library, so the
+standalone ``install.py`` script can load it from the source tree.
+"""
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    import tomllib
+except ImportError:  # Python 3.10
+    tomllib = None
+
+_NAME = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+
+
+def normalize_name(name):
+    """Normalize a distribution name as PEP 503 does"""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def read_project(module_dir):
+    """Read ``(name, dependency names)`` from a module's pyproject.toml
+
+    Returns ``(None, [])`` when the module has no readable pyproject.toml.
+    Dependency names are normalized and stripped of versions and markers.
+    """
+    pyproject = Path(module_dir) / "pyproject.toml"
+    if not pyproject.is_file():
+        return None, []
+    text = pyproject.read_text(encoding="utf-8")
+
+    if tomllib is not None:
+        try:
+            project = tomllib.loads(text).get("project", {})
+        except tomllib.TOMLDecodeError:
+            return None, []
+        name = project.get("name")
+        requirements = project.get("dependencies", [])
+    else:
+        match = re.search(r'^name\s*=\s*["\']([^"\']+)["\']', text, re.MULTILINE)
+        name = match.group(1) if match else None
+        match = re.search(r'^dependencies\s*=\s*\[([^\]]*)\]', text, re.MULTILINE)
+        requirements = re.findall(r'["\']([^"\']+)["\']', match.group(1)) if match else []
+
+    names = []
+    for requirement in requirements:
+        match = _NAME.match(requirement)
+        if match:
+            names.append(normalize_name(match.group(1)))
+    return name, names
+
+
+def dependency_graph(sources):
+    """Map each module in ``sources`` to the other local modules it depends on
+
+    ``sources`` maps module names to checkouts. A dependency is local when
+    it names another module's project (or, lacking one, its module name).
+    """
+    projects = {}
+    dependencies = {}
+    for module, module_dir in sources.items():
+        name, requirements = read_project(module_dir)
+        projects[normalize_name(name or module)] = module
+        dependencies[module] = requirements
+
+    return {
+        module: [projects[r] for r in requirements if r in projects and projects[r] != module]
+        for module, requirements in dependencies.items()
+    }
+
+
+def install_levels(graph):
+    """Group modules into levels whose members only depend on earlier levels
+
+    Modules keep their order from ``graph`` within a level. Raises
+    ``ValueError`` if the dependencies form a cycle.
+    """
+    remaining = {module: set(deps) for module, deps in graph.items()}
+    levels = []
+    while remaining:
+        level = [module for module, deps in remaining.items() if not deps]
+        if not level:
+            raise ValueError(f"Dependency cycle between modules: {', '.join(remaining)}")
+        levels.append(level)
+        for module in level:
+            del remaining[module]
+        for deps in remaining.values():
+            deps.difference_update(level)
+    return levels
+
+
+def install_order(sources):
+    """Return the modules in ``sources`` with dependencies before dependents"""
+    return [module for level in install_levels(dependency_graph(sources)) for module in level]
+
+
+def ready_levels(graph, failed):
+    """Yield each level of ``graph`` as the modules whose dependencies all built
+
+    ``failed`` is a list the caller extends with the modules that failed to
+    build before asking for the next level; modules depending on any of
+    them are added to it instead of being yielded.
+    """
+    for level in install_levels(graph):
+        ready = [m for m in level if not any(dep in failed for dep in graph[m])]
+        failed += [m for m in level if m not in ready]
+        if ready:
+            yield ready
+
+
+def staging_dir(wheel_dir, module):
+    """Create a private directory for one module's build inside ``wheel_dir``"""
+    return Path(tempfile.mkdtemp(prefix=f".{module}-", dir=wheel_dir))
+
+
+def build_command(pip_exe, staging, wheel_dir, source):
+    """Build the pip command that builds one module's wheels into ``staging``"""
+    return [str(pip_exe), "wheel", "--wheel-dir", str(staging), "--find-links",
+            str(wheel_dir), str(source)]
+
+
+def publish_wheels(staging, wheel_dir):
+    """Move a finished build's wheels into ``wheel_dir``"""
+    for wheel in os.listdir(staging):
+        os.replace(os.path.join(staging, wheel), Path(wheel_dir) / wheel)
+
+
+def _run(name, cmd):
+    return subprocess.run(cmd, capture_output=True, text=True).returncode
+
+
+def build_wheels(pip_exe, sources, wheel_dir, jobs, run=_run):
+    """Build wheels for local modules level by level, returning the names that failed
+
+    Modules in the same level build at the same time, up to ``jobs`` at
+    once, each in its own pip process. Every build writes to a private
+    directory before its wheels move into ``wheel_dir``, and later levels
+    resolve local dependencies from there. Modules whose dependencies
+    failed are not attempted. ``run(name, cmd)`` runs one build and
+    returns its exit code.
+    """
+    graph = dependency_graph(sources)
+    wheel_dir = Path(wheel_dir)
+    wheel_dir.mkdir(parents=True, exist_ok=True)
+    failed = []
+
+    def build(module):
+        staging = staging_dir(wheel_dir, module)
+        try:
+            returncode = run(module, build_command(pip_exe, staging, wheel_dir, sources[module]))
+            if returncode == 0:
+                publish_wheels(staging, wheel_dir)
+            return returncode
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    for ready in ready_levels(graph, failed):
+        with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(ready)))) as pool:
+            for module, returncode in zip(ready, pool.map(build, ready)):
+                if returncode != 0:
+                    failed.append(module)
+    return failed
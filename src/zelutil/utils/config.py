@@ -1,7 +1,7 @@
-import json
-from pathlib import Path
+import copy
 
-from .state import resolve_state_dir
+from . import daemon
+from .state import file_lock, resolve_state_dir, resolve_state_file, write_state_file
 
 
 def load_config(app_name=None):
@@ -13,22 +13,12 @@ def load_config(app_name=None):
     else:
         config_file = state_dir / "config.json"
     
-    if config_file.exists():
-        with open(config_file) as f:
-            return json.load(f)
-    return {}
+    return copy.deepcopy(daemon.load_state_file(config_file, "config", app_name=app_name))
 
 
 def save_config(config, app_name=None):
     """Save configuration for app or global config"""
-    state_dir = resolve_state_dir()
-    
-    if app_name:
-        config_dir = state_dir / app_name
-        config_dir.mkdir(parents=True, exist_ok=True)
-        config_file = config_dir / "config.json"
-    else:
-        config_file = state_dir / "config.json"
-    
-    with open(config_file, 'w') as f:
-        json.dump(config, f, indent=2)
\ No newline at end of file
+    path = resolve_state_file(f"{app_name}/config" if app_name else "config")
+    # The whole file is replaced, so the old contents are never read
+    with file_lock(path):
+        write_state_file(path, config)
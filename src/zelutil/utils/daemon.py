@@ -0,0 +1,64 @@
+"""Client for the optional ``zelutil serve`` daemon.
+
+Callers try ``request`` first and fall back to reading files themselves
+when it reports the daemon is unavailable.
+"""
+import json
+import os
+
+from .state import resolve_state_dir, cached_state_file, read_state_file, seed_state_file
+
+# Set in the daemon process so its own lookups never loop back to itself
+_disabled = False
+
+
+def get_socket_path():
+    """Get the Unix socket the daemon listens on"""
+    return resolve_state_dir() / "zelutil.sock"
+
+
+def request(op, **args):
+    """Ask the daemon for ``op``, returning ``(True, result)`` or ``(False, None)``
+
+    ``(False, None)`` means no daemon answered and the caller should read
+    the files directly.
+    """
+    if _disabled:
+        return False, None
+    path = get_socket_path()
+    if not os.path.exists(path):
+        return False, None
+
+    import socket
+    if not hasattr(socket, "AF_UNIX"):
+        return False, None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(1.0)
+            sock.connect(str(path))
+            sock.sendall(json.dumps({"op": op, "args": args}).encode() + b"\n")
+            with sock.makefile("rb") as f:
+                reply = json.loads(f.readline())
+    except (OSError, ValueError):
+        return False, None
+
+    if not reply.get("ok"):
+        return False, None
+    return True, reply.get("result")
+
+
+def load_state_file(path, op, **args):
+    """Read a state file from the in-process cache, the daemon if running, or disk
+
+    Data served by the daemon comes with the signature it was read at and
+    seeds the in-process cache, so repeated calls only cost a ``stat``.
+    """
+    data = cached_state_file(path)
+    if data is not None:
+        return data
+    ok, reply = request(op, **args)
+    if ok:
+        if reply["signature"] is not None:
+            seed_state_file(path, reply["signature"], reply["data"])
+        return reply["data"]
+    return read_state_file(path, {})
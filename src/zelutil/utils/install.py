@@ -1,9 +1,13 @@
 #!/usr/bin/env python3
+import argparse
+import importlib
 import json
 import os
 import platform
 import subprocess
 import sys
+import threading
+import time
 from importlib import resources
 from pathlib import Path
 
@@ -111,7 +115,84 @@ def load_modules():
 
     return payload.get("modules", {})
 
+# Chrome trace events collected when --trace is given
+_trace = None
+_trace_origin = time.perf_counter()
+
+def run_step(name, module, cmd, **kwargs):
+    """Run a command, recording it as a trace event when tracing is on"""
+    start = time.perf_counter()
+    result = subprocess.run(cmd, **kwargs)
+    if _trace is not None:
+        end = time.perf_counter()
+        _trace.append({
+            "name": f"{name} {module}" if module else name,
+            "cat": name,
+            "ph": "X",
+            "ts": (start - _trace_origin) * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": {"status": result.returncode},
+        })
+    return result
+
+def pip_install_editable(pip_exe, components, install_dir, batch=True):
+    """Install components in editable mode, returning the names that failed"""
+    wheel_dir = install_dir / "wheelhouse"
+    if wheel_dir.is_dir() and components:
+        # Wheels cached by `zelutil module install` allow an offline install
+        print(f"Installing {', '.join(components)} from the wheelhouse...")
+        cmd = [str(pip_exe), "install", "--no-index", "--find-links", str(wheel_dir)]
+        for component in components:
+            cmd += ["-e", str(install_dir / component)]
+        if run_step("pip install", None, cmd).returncode == 0:
+            return []
+        print("Wheelhouse install failed, falling back to the package index...")
+    
+    if batch and len(components) > 1:
+        # One pip run resolves shared dependencies once
+        print(f"Installing {', '.join(components)}...")
+        cmd = [str(pip_exe), "install"]
+        for component in components:
+            cmd += ["-e", str(install_dir / component)]
+        if run_step("pip install", None, cmd).returncode == 0:
+            return []
+        print("Batched install failed, retrying one module at a time...")
+    
+    failed = []
+    for component in components:
+        print(f"Installing {component}...")
+        result = run_step("pip install", component,
+                          [str(pip_exe), "install", "-e", str(install_dir / component)])
+        if result.returncode != 0:
+            failed.append(component)
+    return failed
+
+def load_helper(name):
+    """Import a standard-library-only helper module that lives next to this file
+
+    Run as a script this directory is on sys.path; run with ``python -m``
+    or imported from the package, the helper comes from the package too.
+    """
+    if __package__:
+        return importlib.import_module(f"{__package__}.{name}")
+    return importlib.import_module(name)
+
 def main():
+    parser = argparse.ArgumentParser(description="Install zel components into the zel venv")
+    parser.add_argument("--no-batch", action="store_true",
+                        help="Run pip once per component instead of a single batched run")
+    parser.add_argument("--template", action="store_true",
+                        help="Clone a missing venv from the template venv instead of building it")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="Write a Chrome trace of each venv and pip step to PATH")
+    args = parser.parse_args()
+    
+    global _trace
+    if args.trace:
+        _trace = []
+    
     # Use install directory to find zel components
     install_dir = get_install_dir()
     venv_path = get_venv_path()
@@ -122,11 +203,14 @@ def main():
         print("No module metadata available; nothing to install.")
         return
     
-    if not venv_path.exists():
-        print(f"Creating zel virtual environment at {venv_path}...")
-        subprocess.run([sys.executable, "-m", "venv", str(venv_path)], check=True)
-    else:
+    venv_template = load_helper("venv_template") if args.template else None
+    use_template = args.template and not venv_path.exists() and venv_template.is_supported()
+    
+    if venv_path.exists():
         print(f"Using existing virtual environment at {venv_path}...")
+    elif not use_template:
+        print(f"Creating zel virtual environment at {venv_path}...")
+        run_step("venv create", None, [sys.executable, "-m", "venv", str(venv_path)], check=True)
     
     # Get executables
     if platform.system() == "Windows":
@@ -139,17 +223,47 @@ def main():
         bin_path = venv_path / "bin"
     
     print("Installing zel components...")
+    present = []
     for component in components:
         component_path = install_dir / component
         if component_path.exists():
-            print(f"Installing {component}...")
-            subprocess.run([str(pip_exe), "install", "-e", str(component_path)], check=True)
+            present.append(component)
         else:
             print(f"Skipping {component} (not found at {component_path})")
     
+    build_plan = load_helper("build_plan")
+    sources = {component: install_dir / component for component in present}
+    try:
+        present = build_plan.install_order(sources)
+    except ValueError as exc:
+        print(f"Warning: {exc}; installing in registry order")
+    
+    batch = not args.no_batch
+    if use_template:
+        failed = venv_template.provision_venv(
+            venv_path, venv_template.get_template_path(install_dir), sources,
+            lambda pip, names: pip_install_editable(pip, names, install_dir, batch=batch)
+        )
+    else:
+        failed = pip_install_editable(pip_exe, present, install_dir, batch=batch)
+        if venv_template is not None:
+            installed = {c: sources[c] for c in present if c not in failed}
+            venv_template.write_record(venv_path, installed)
+    for component in failed:
+        print(f"Failed to install {component}")
+    
     print("Adding to PATH...")
     add_to_path(bin_path)
     
+    if _trace is not None:
+        with open(args.trace, "w") as f:
+            json.dump({"traceEvents": _trace, "displayTimeUnit": "ms"}, f, indent=2)
+        print(f"Trace written to {args.trace}")
+    
+    if failed:
+        print("\nDone, but some zel tools failed to install.")
+        sys.exit(1)
+    
     print("\nDone! All available zel tools installed.")
     print(f"Installation directory: {install_dir}")
     print(f"Virtual environment: {venv_path}")
@@ -1,18 +1,33 @@
+from ..core.manifest import INSTALLED, get_manifest_file, load_manifest
 from ..core.registry import load_modules
-from ..core.installer import get_install_dir
+from . import daemon
 
 
-def get_installed_apps():
-    """Get list of installed Zel apps"""
-    install_dir = get_install_dir()
-    modules = load_modules()
+def get_installed_apps(verify=False, installed_only=False):
+    """Get list of installed Zel apps
+
+    Answers from the installed-apps manifest. ``verify`` re-scans the
+    install directory and rewrites the manifest first. ``installed_only``
+    leaves out modules that are cloned but not pip-installed.
+    """
+    if not verify:
+        ok, names = daemon.request("installed_apps", installed_only=installed_only)
+        if ok:
+            return names
     
-    installed = []
-    for module_name in modules.keys():
-        if (install_dir / module_name).exists():
-            installed.append(module_name)
+    modules = load_modules()
+    if verify or not get_manifest_file().exists():
+        from ..core.installer import get_install_dir
+        from ..core.manifest import scan_install_dir
+        manifest = scan_install_dir(get_install_dir(), modules)
+    else:
+        manifest = load_manifest()
     
-    return installed
+    return [
+        name for name in modules
+        if name in manifest
+        and (not installed_only or manifest[name].get("status") == INSTALLED)
+    ]
 
 
 def get_app_data_dir(app_name):
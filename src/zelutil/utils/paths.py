@@ -1,6 +1,9 @@
-import json
-from pathlib import Path
-from .state import resolve_state_dir
+from . import daemon
+from .state import resolve_state_dir, state_transaction
+
+def _load_paths():
+    """Load paths.json from the in-process cache, the daemon if running, or disk."""
+    return daemon.load_state_file(resolve_state_dir() / "paths.json", "paths")
 
 def get_path(key, cli_override=None, save_if_override=False, default=None):
     """Get path from paths.json with override and save options."""
@@ -9,29 +12,41 @@ def get_path(key, cli_override=None, save_if_override=False, default=None):
             set_path(key, cli_override)
         return cli_override
     
-    paths_file = resolve_state_dir() / "paths.json"
-    if paths_file.exists():
-        with open(paths_file) as f:
-            paths = json.load(f)
-            if key in paths:
-                return paths[key]
+    paths = _load_paths()
+    if key in paths:
+        return paths[key]
     
     if default:
         return default
     
     raise ValueError(f"Path '{key}' not found. Use --save-path to set it.")
 
-def set_path(key, value):
-    """Set a path in paths.json."""
-    state_dir = resolve_state_dir()
-    state_dir.mkdir(parents=True, exist_ok=True)
+def get_paths(keys, defaults=None):
+    """Get several paths from paths.json with a single read."""
+    paths = _load_paths()
+    defaults = defaults or {}
     
-    paths_file = state_dir / "paths.json"
-    paths = {}
-    if paths_file.exists():
-        with open(paths_file) as f:
-            paths = json.load(f)
+    resolved = {}
+    missing = []
+    for key in keys:
+        if key in paths:
+            resolved[key] = paths[key]
+        elif defaults.get(key):
+            resolved[key] = defaults[key]
+        else:
+            missing.append(key)
     
-    paths[key] = str(value)
-    with open(paths_file, 'w') as f:
-        json.dump(paths, f, indent=2)
+    if missing:
+        raise ValueError(f"Paths not found: {', '.join(missing)}. Use --save-path to set them.")
+    return resolved
+
+def set_path(key, value):
+    """Set a path in paths.json."""
+    with state_transaction("paths") as paths:
+        paths[key] = str(value)
+
+def set_paths(values):
+    """Set several paths in paths.json with a single write."""
+    with state_transaction("paths") as paths:
+        for key, value in values.items():
+            paths[key] = str(value)
@@ -1,5 +1,196 @@
+import copy
+import json
+import os
+import stat
+import tempfile
+import time
+from contextlib import contextmanager
 from pathlib import Path
 
+# Parsed JSON state files keyed by path, tagged with (mtime_ns, size)
+_state_file_cache = {}
+
+
 def resolve_state_dir():
     """Resolve the shared state directory for all zel apps."""
     return Path.home() / ".local" / "state" / "zel"
+
+
+def read_state_file(path, default=None, strict=True):
+    """Read a JSON state file, reusing the parsed data while the file is unchanged.
+
+    Entries are validated against the file's (mtime_ns, size) on every call.
+    The returned object is shared between callers; copy it before mutating.
+    A file that is not valid JSON raises ``json.JSONDecodeError``, or with
+    ``strict=False`` reads as ``default`` like a missing file.
+    """
+    try:
+        signature, data = read_state_file_signed(path)
+    except json.JSONDecodeError:
+        if strict:
+            raise
+        return default
+    return default if signature is None else data
+
+
+def read_state_file_signed(path):
+    """Like ``read_state_file`` but return ``(signature, data)``, or ``(None, None)`` if missing."""
+    key = str(path)
+    try:
+        st = os.stat(key)
+    except FileNotFoundError:
+        _state_file_cache.pop(key, None)
+        return None, None
+
+    signature = (st.st_mtime_ns, st.st_size)
+    cached = _state_file_cache.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached
+
+    with open(key) as f:
+        data = json.load(f)
+    _state_file_cache[key] = (signature, data)
+    return signature, data
+
+
+def cached_state_file(path):
+    """Return the cached data for a state file if it is still current, else None."""
+    cached = _state_file_cache.get(str(path))
+    if cached is None:
+        return None
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    if cached[0] != (st.st_mtime_ns, st.st_size):
+        return None
+    return cached[1]
+
+
+def seed_state_file(path, signature, data):
+    """Cache data for a state file that was read elsewhere with the given signature."""
+    _state_file_cache[str(path)] = (tuple(signature), data)
+
+
+def invalidate_state_file(path=None):
+    """Drop a cached state file, or every cached file if no path is given."""
+    if path is None:
+        _state_file_cache.clear()
+    else:
+        _state_file_cache.pop(str(path), None)
+
+
+class StateData(dict):
+    """Contents of a state file held open by ``state_transaction``.
+
+    ``lock_wait`` is the number of seconds spent waiting for the lock.
+    """
+
+    def __init__(self, data, path, lock_wait):
+        super().__init__(data)
+        self.path = path
+        self.lock_wait = lock_wait
+
+
+def resolve_state_file(name):
+    """Resolve a state file name such as "paths" or "zeltimer/config"."""
+    return resolve_state_dir() / f"{name}.json"
+
+
+@contextmanager
+def atomic_write(path):
+    """Yield a temp file next to ``path`` that replaces ``path`` when the block succeeds.
+
+    The new file keeps the permissions of the file it replaces.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o644
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w', encoding="utf-8") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def write_state_file(path, data):
+    """Atomically replace a JSON state file by writing a temp file and renaming it."""
+    with atomic_write(path) as f:
+        json.dump(data, f, indent=2)
+    invalidate_state_file(path)
+
+
+def _lock_file(f):
+    """Block until an exclusive advisory lock on an open file is held."""
+    if os.name == "nt":
+        import msvcrt
+        f.seek(0)
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                return
+            except OSError:
+                time.sleep(0.01)
+    else:
+        import fcntl
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+
+def _unlock_file(f):
+    """Release a lock taken by ``_lock_file``."""
+    if os.name == "nt":
+        import msvcrt
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def file_lock(path):
+    """Hold an exclusive advisory lock on ``<path>.lock``, yielding the wait in seconds."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + ".lock"), "a+") as lock:
+        start = time.perf_counter()
+        _lock_file(lock)
+        try:
+            yield time.perf_counter() - start
+        finally:
+            _unlock_file(lock)
+
+
+@contextmanager
+def state_transaction(name=None, path=None):
+    """Lock a state file, yield its contents and commit them atomically on exit.
+
+    Either a state file ``name`` (e.g. ``"paths"``) or an explicit ``path``
+    is accepted. Many mutations can be applied to the yielded ``StateData``
+    and are written back with one write-and-rename, only if something
+    changed. Nothing is written if the block raises. A file that is not a
+    JSON object starts the transaction empty and is replaced on commit.
+    """
+    path = Path(path) if path is not None else resolve_state_file(name)
+
+    with file_lock(path) as lock_wait:
+        invalidate_state_file(path)
+        original = read_state_file(path, {}, strict=False)
+        if not isinstance(original, dict):
+            original = {}
+        data = StateData(copy.deepcopy(original), path, lock_wait)
+        yield data
+        if dict(data) != original:
+            write_state_file(path, dict(data))
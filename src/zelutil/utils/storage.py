@@ -0,0 +1,209 @@
+"""SQLite storage engine for the active/completed/blueprint data standard."""
+import json
+import sqlite3
+import uuid
+
+from .state import resolve_state_dir
+
+COLLECTIONS = ("active", "completed", "blueprint")
+
+# Item fields checked, in order, for the date used by range queries
+DATE_FIELDS = ("date", "completed_at", "ended_at", "end", "created_at", "started_at", "start")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    collection TEXT NOT NULL,
+    id TEXT NOT NULL,
+    day TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (collection, id)
+);
+CREATE INDEX IF NOT EXISTS items_day ON items (collection, day);
+"""
+
+
+def item_day(item, date_fields=DATE_FIELDS):
+    """Get the ``YYYY-MM-DD`` day of an item from its first date field, or None"""
+    for field in date_fields:
+        value = item.get(field)
+        if isinstance(value, str) and len(value) >= 10:
+            return value[:10]
+    return None
+
+
+class AppStorage:
+    """Per-app item storage backed by ``<state_dir>/<app>/storage.db``.
+
+    Items are JSON objects kept in the ``active``, ``completed`` and
+    ``blueprint`` collections. Each item has a string ``id`` (one is
+    generated if missing). Every change touches a single row, and the
+    database runs in WAL mode so readers never block the writer.
+    """
+
+    def __init__(self, app_name, path=None, date_fields=DATE_FIELDS):
+        if path is None:
+            app_dir = resolve_state_dir() / app_name
+            app_dir.mkdir(parents=True, exist_ok=True)
+            path = app_dir / "storage.db"
+        self.app_name = app_name
+        self.path = path
+        self.date_fields = date_fields
+        self.conn = sqlite3.connect(str(path), timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def _check(self, collection):
+        if collection not in COLLECTIONS:
+            raise ValueError(f"Unknown collection '{collection}'. Use one of: {', '.join(COLLECTIONS)}")
+
+    def _row(self, collection, item):
+        item_id = str(item.get("id") or uuid.uuid4().hex)
+        item = {**item, "id": item_id}
+        return (collection, item_id, item_day(item, self.date_fields), json.dumps(item)), item_id
+
+    def put(self, collection, item):
+        """Insert or replace one item, returning its id"""
+        self._check(collection)
+        row, item_id = self._row(collection, item)
+        self.conn.execute("INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?)", row)
+        return item_id
+
+    def put_many(self, collection, items):
+        """Insert or replace many items in one transaction, returning their ids"""
+        self._check(collection)
+        rows = [self._row(collection, item) for item in items]
+        with self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.executemany("INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?)",
+                                  [row for row, _ in rows])
+        return [item_id for _, item_id in rows]
+
+    def get(self, collection, item_id):
+        """Get one item by id, or None"""
+        self._check(collection)
+        row = self.conn.execute(
+            "SELECT data FROM items WHERE collection = ? AND id = ?", (collection, str(item_id))
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def delete(self, collection, item_id):
+        """Delete one item, returning whether it existed"""
+        self._check(collection)
+        cursor = self.conn.execute(
+            "DELETE FROM items WHERE collection = ? AND id = ?", (collection, str(item_id))
+        )
+        return cursor.rowcount > 0
+
+    def move(self, item_id, source, target, changes=None):
+        """Move an item between collections, e.g. active to completed
+
+        ``changes`` are merged into the item on the way. Returns the moved
+        item, or None if it was not in ``source``.
+        """
+        self._check(source)
+        self._check(target)
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            item = self.get(source, item_id)
+            if item is None:
+                return None
+            item.update(changes or {})
+            self.conn.execute("DELETE FROM items WHERE collection = ? AND id = ?",
+                              (source, str(item_id)))
+            self.put(target, item)
+        return item
+
+    def items(self, collection, since=None, until=None):
+        """Iterate over items, optionally limited to days in ``[since, until]``
+
+        ``since`` and ``until`` are ``YYYY-MM-DD`` strings and use the day
+        index; items without a date are left out when either is given.
+        """
+        self._check(collection)
+        query = "SELECT data FROM items WHERE collection = ?"
+        params = [collection]
+        if since is not None:
+            query += " AND day >= ?"
+            params.append(str(since)[:10])
+        if until is not None:
+            query += " AND day <= ?"
+            params.append(str(until)[:10])
+        if since is not None or until is not None:
+            query += " ORDER BY day"
+        for (data,) in self.conn.execute(query, params):
+            yield json.loads(data)
+
+    def day_counts(self, collection, since=None, until=None):
+        """Count dated items per day, optionally limited to days in ``[since, until]``"""
+        self._check(collection)
+        query = "SELECT day, COUNT(*) FROM items WHERE collection = ? AND day IS NOT NULL"
+        params = [collection]
+        if since is not None:
+            query += " AND day >= ?"
+            params.append(str(since)[:10])
+        if until is not None:
+            query += " AND day <= ?"
+            params.append(str(until)[:10])
+        query += " GROUP BY day ORDER BY day"
+        return dict(self.conn.execute(query, params).fetchall())
+
+    def count(self, collection):
+        """Count the items in a collection"""
+        self._check(collection)
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM items WHERE collection = ?", (collection,)
+        ).fetchone()[0]
+
+
+def _json_items(data):
+    """Normalise a legacy collection file into a list of items"""
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        for key in ("items", "tasks", "entries"):
+            if isinstance(data.get(key), list):
+                return data[key]
+        if all(isinstance(value, dict) for value in data.values()):
+            return [{"id": key, **value} for key, value in data.items()]
+    raise ValueError("Unsupported layout: expected a list of items or a mapping of id to item")
+
+
+def migrate_json(app_name, storage=None):
+    """Import an app's active/completed/blueprint JSON files into SQLite storage
+
+    The JSON files are left in place, and re-running the migration replaces
+    the imported rows instead of duplicating them. Returns the number of
+    items imported per collection.
+    """
+    app_dir = resolve_state_dir() / app_name
+    owned = storage is None
+    storage = storage or AppStorage(app_name)
+    counts = {}
+    try:
+        for collection in COLLECTIONS:
+            json_file = app_dir / f"{collection}.json"
+            if not json_file.exists():
+                continue
+            with open(json_file, encoding="utf-8") as f:
+                items = _json_items(json.load(f))
+            # Stable ids for items that had none keep re-runs idempotent
+            items = [
+                item if item.get("id") else {**item, "id": f"legacy-{index}"}
+                for index, item in enumerate(items)
+            ]
+            storage.put_many(collection, items)
+            counts[collection] = len(items)
+    finally:
+        if owned:
+            storage.close()
+    return counts
@@ -0,0 +1,181 @@
+"""Streaming readers for large item files."""
+import json
+import re
+
+from .state import resolve_state_dir
+from .storage import item_day
+
+CHUNK_SIZE = 1 << 16
+
+# Keys whose list holds the items when a file wraps them in an object
+ITEM_LIST_KEYS = ("items", "tasks", "entries")
+
+_WHITESPACE = " \t\n\r"
+
+# Characters that can follow a number or literal, proving it is complete
+_SCALAR_END = re.compile(r"[\s,\]}:]")
+
+
+class _JsonReader:
+    """Pull JSON values one at a time from a file read in fixed-size chunks."""
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        """Read another chunk, dropping what was already consumed. False at EOF."""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Skip whitespace and return the next character, or '' at EOF"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' at offset {self.pos} of the buffered input")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value, reading more input as needed"""
+        char = self.peek()
+        if char and char not in '{["':
+            # A number or literal may continue into the next chunk ("1." or
+            # "1.5e" still decode as a shorter value), so read until its end
+            # is buffered
+            while not _SCALAR_END.search(self.buf, self.pos) and self._fill():
+                pass
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            self.pos = end
+            return value
+
+    def array(self):
+        """Yield the elements of the array starting at the current position"""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            char = self.peek()
+            self.pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' but found {char!r}")
+
+    def object_items(self):
+        """Yield (key, value) pairs of the object starting at the current position
+
+        Values under ``ITEM_LIST_KEYS`` that are arrays are yielded as a lazy
+        iterator instead of being decoded whole.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            if key in ITEM_LIST_KEYS and self.peek() == "[":
+                yield key, self.array()
+            else:
+                yield key, self.value()
+            char = self.peek()
+            self.pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise ValueError(f"Expected ',' or '}}' but found {char!r}")
+
+
+def iter_json_items(path, chunk_size=CHUNK_SIZE):
+    """Yield the items of a legacy JSON collection file without loading it whole
+
+    Accepts the same layouts as ``storage.migrate_json``: a list of items,
+    an object wrapping the list under ``items``/``tasks``/``entries``, or a
+    mapping of id to item.
+    """
+    with open(path, encoding="utf-8") as f:
+        reader = _JsonReader(f, chunk_size)
+        first = reader.peek()
+        if first == "[":
+            yield from reader.array()
+        elif first == "{":
+            for key, value in reader.object_items():
+                if key in ITEM_LIST_KEYS and not isinstance(value, dict):
+                    yield from value
+                elif isinstance(value, dict):
+                    yield {"id": key, **value}
+        elif first:
+            raise ValueError(f"Unsupported layout in {path}: expected a list or an object")
+
+
+def iter_items(app_name, collection="completed", since=None, until=None, ordered=False):
+    """Yield an app's items one at a time, optionally limited to days in ``[since, until]``
+
+    Reads ``<collection>.jsonl`` when the app keeps an append-only log and
+    the legacy ``<collection>.json`` otherwise. ``since``/``until`` are
+    ``YYYY-MM-DD`` strings matched against each item's date; undated items
+    are skipped when either is given. With ``ordered`` the file is trusted
+    to be in ascending date order and reading stops at the first item past
+    ``until``; for a ``.jsonl`` log, reading also starts at the first item
+    on or after ``since``, found by bisecting the file. Legacy ``.json``
+    files cannot be entered mid-way, so they are always read from the
+    start. Stop early by simply breaking out of the loop.
+    """
+    app_dir = resolve_state_dir() / app_name
+    log_file = app_dir / f"{collection}.jsonl"
+    json_file = app_dir / f"{collection}.json"
+
+    if log_file.exists():
+        from .archive import ItemLog
+        log = ItemLog(app_name, collection, path=log_file)
+        start = log.offset_of_day(str(since)[:10]) if ordered and since is not None else 0
+        source = log.items(start)
+    elif json_file.exists():
+        source = iter_json_items(json_file)
+    else:
+        return
+
+    if since is None and until is None:
+        yield from source
+        return
+
+    since = str(since)[:10] if since is not None else None
+    until = str(until)[:10] if until is not None else None
+    for item in source:
+        day = item_day(item) if isinstance(item, dict) else None
+        if day is None:
+            continue
+        if until is not None and day > until:
+            if ordered:
+                return
+            continue
+        if since is not None and day < since:
+            continue
+        yield item
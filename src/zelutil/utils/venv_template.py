@@ -0,0 +1,175 @@
+"""Provision venvs by cloning a pre-populated template environment.
+
+This module only uses the standard library and no package-relative
+imports, so the standalone ``install.py`` and ``dev-install.py`` scripts
+can load it straight from the source tree.
+"""
+import hashlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+TEMPLATE_NAME = "venv-template"
+
+# Record of what each venv has installed, kept inside the venv itself
+RECORD_NAME = "zel-modules.json"
+
+# Files whose contents decide what an editable install produces
+BUILD_FILES = ("pyproject.toml", "setup.cfg", "setup.py", "entry_points.txt")
+
+
+def get_template_path(install_dir):
+    """Get the template venv that new venvs are cloned from"""
+    return Path(install_dir) / TEMPLATE_NAME
+
+
+def is_supported():
+    """Check whether venvs can be cloned on this platform
+
+    Windows entry-point launchers embed the interpreter path in a binary,
+    so cloned copies would keep running the template's interpreter.
+    """
+    return platform.system() != "Windows"
+
+
+def build_fingerprint(module_dir):
+    """Hash the build files of a module checkout"""
+    digest = hashlib.sha256()
+    for name in BUILD_FILES:
+        path = Path(module_dir) / name
+        if path.is_file():
+            digest.update(name.encode())
+            digest.update(b"\0")
+            digest.update(path.read_bytes())
+            digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def read_record(venv_path):
+    """Load the build fingerprints of the modules installed in a venv"""
+    try:
+        with open(Path(venv_path) / RECORD_NAME, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def write_record(venv_path, sources):
+    """Record the build fingerprints of modules just installed in a venv"""
+    record = read_record(venv_path)
+    for name, module_dir in sources.items():
+        record[name] = build_fingerprint(module_dir)
+    # Replace rather than rewrite: a clone's record starts as a hardlink
+    # to the template's
+    path = Path(venv_path) / RECORD_NAME
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(record, f, indent=2)
+    os.replace(tmp, path)
+
+
+def missing_modules(venv_path, sources):
+    """Return the names in ``sources`` whose current build the venv lacks"""
+    record = read_record(venv_path)
+    return [name for name, module_dir in sources.items()
+            if record.get(name) != build_fingerprint(module_dir)]
+
+
+def create_venv(venv_path):
+    """Create an empty venv with the running interpreter"""
+    subprocess.run([sys.executable, "-m", "venv", str(venv_path)], check=True)
+
+
+def venv_pip(venv_path):
+    """Get the pip executable of a venv"""
+    if platform.system() == "Windows":
+        return Path(venv_path) / "Scripts" / "pip.exe"
+    return Path(venv_path) / "bin" / "pip"
+
+
+def _link_or_copy(src, dst):
+    try:
+        os.link(src, dst)
+        return True
+    except OSError:
+        shutil.copy2(src, dst)
+        return False
+
+
+def clone_venv(template, target):
+    """Stamp out ``target`` from ``template``, returning the number of files linked
+
+    ``site-packages`` and other library files are hardlinked (or copied
+    when the filesystem refuses). Scripts and ``pyvenv.cfg`` mention the
+    venv's own path, so they are rewritten rather than shared. Symlinks
+    into the template are pointed at the clone.
+    """
+    template = Path(template)
+    target = Path(target)
+    old = str(template).encode()
+    new = str(target).encode()
+    rewrite_dirs = {template / "bin", template / "Scripts"}
+    linked = 0
+
+    for root, dirs, files in os.walk(template):
+        root = Path(root)
+        dest_root = target / root.relative_to(template)
+        dest_root.mkdir(parents=True, exist_ok=True)
+
+        for name in dirs + files:
+            src = root / name
+            dst = dest_root / name
+            if src.is_symlink():
+                link = os.readlink(src)
+                if link.startswith(str(template)):
+                    link = str(target) + link[len(str(template)):]
+                os.symlink(link, dst)
+                if name in dirs:
+                    dirs.remove(name)
+                continue
+            if name in dirs:
+                continue
+
+            if root in rewrite_dirs or src == template / "pyvenv.cfg":
+                data = src.read_bytes()
+                if old in data and b"\0" not in data:
+                    dst.write_bytes(data.replace(old, new))
+                    shutil.copymode(src, dst)
+                    continue
+            linked += _link_or_copy(src, dst)
+    return linked
+
+
+def provision_venv(venv_path, template, sources, install):
+    """Create ``venv_path`` from ``template``, installing only the delta
+
+    ``sources`` maps module names to their checkouts and ``install(pip_exe,
+    names)`` installs names into a venv, returning the ones that failed.
+    The template is created on first use and brought up to date before
+    being cloned, so the clone usually needs no pip run at all. Returns
+    the names that failed to install into ``venv_path``.
+    """
+    template = Path(template)
+    if not template.exists():
+        print(f"Creating template virtual environment at {template}...")
+        create_venv(template)
+
+    stale = missing_modules(template, sources)
+    if stale:
+        print(f"Updating template with {', '.join(stale)}...")
+        failed = install(venv_pip(template), stale)
+        write_record(template, {n: sources[n] for n in stale if n not in failed})
+
+    print(f"Cloning {template} to {venv_path}...")
+    clone_venv(template, venv_path)
+
+    delta = missing_modules(venv_path, sources)
+    if not delta:
+        return []
+    failed = install(venv_pip(venv_path), delta)
+    write_record(venv_path, {n: sources[n] for n in delta if n not in failed})
+    return failed
@@ -0,0 +1,75 @@
+import json
+import subprocess
+
+import pytest
+
+from zelutil.core.registry import load_modules
+from zelutil.utils.state import invalidate_state_file
+
+
+def git(*args, cwd=None):
+    """Run git quietly, returning stdout"""
+    result = subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True)
+    return result.stdout.strip()
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    """Point HOME at an empty directory so state and installs stay isolated"""
+    home_dir = tmp_path / "home"
+    home_dir.mkdir()
+    monkeypatch.setenv("HOME", str(home_dir))
+    monkeypatch.setenv("GIT_CONFIG_GLOBAL", str(tmp_path / "gitconfig"))
+    monkeypatch.setenv("GIT_AUTHOR_NAME", "test")
+    monkeypatch.setenv("GIT_AUTHOR_EMAIL", "test@example.com")
+    monkeypatch.setenv("GIT_COMMITTER_NAME", "test")
+    monkeypatch.setenv("GIT_COMMITTER_EMAIL", "test@example.com")
+    invalidate_state_file()
+    load_modules.cache_clear()
+    yield home_dir
+    invalidate_state_file()
+    load_modules.cache_clear()
+
+
+class Upstream:
+    """A bare repo plus a work tree used to push new commits to it"""
+
+    def __init__(self, root, name):
+        self.name = name
+        self.bare = root / f"{name}.git"
+        self.work = root / f"{name}-work"
+        git("init", "-q", "-b", "main", str(self.work))
+        self.commit("initial")
+        git("clone", "-q", "--bare", str(self.work), str(self.bare))
+        git("remote", "add", "origin", str(self.bare), cwd=self.work)
+
+    @property
+    def url(self):
+        return self.bare.as_uri()
+
+    def commit(self, message):
+        """Commit a new file and push it if the bare repo exists"""
+        (self.work / f"{message}.txt").write_text(message)
+        git("add", "-A", cwd=self.work)
+        git("commit", "-q", "-m", message, cwd=self.work)
+        if self.bare.exists():
+            git("push", "-q", "origin", "main", cwd=self.work)
+        return git("rev-parse", "HEAD", cwd=self.work)
+
+
+@pytest.fixture
+def upstream(tmp_path, home):
+    """Create a local upstream registered as a module in the user overlay"""
+    root = tmp_path / "upstream"
+    root.mkdir()
+    overlay_dir = home / ".local" / "state" / "zel" / "modules.d"
+    overlay_dir.mkdir(parents=True, exist_ok=True)
+
+    def make(name):
+        repo = Upstream(root, name)
+        overlay = overlay_dir / f"{name}.json"
+        overlay.write_text(json.dumps({"modules": {name: {"name": name, "git_url": repo.url}}}))
+        load_modules.cache_clear()
+        return repo
+
+    return make
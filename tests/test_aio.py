@@ -0,0 +1,88 @@
+import asyncio
+import json
+import sys
+
+from zelutil import aio
+from zelutil.core import updater
+from zelutil.core.installer import clone_modules, get_install_dir
+
+from conftest import git
+
+# Stands in for pip: writes one wheel per source, fails for "broken"
+FAKE_PIP = """\
+import pathlib, sys
+args = sys.argv[1:]
+wheel_dir = pathlib.Path(args[args.index("--wheel-dir") + 1])
+source = pathlib.Path(args[-1])
+if source.name == "broken":
+    sys.exit(1)
+(wheel_dir / f"{source.name}-1.0-py3-none-any.whl").write_text("")
+"""
+
+
+def test_update_fast_forwards_and_reports_divergence(upstream):
+    behind = upstream("zeltimer")
+    diverged = upstream("zelblock")
+    cloned, _, failed = clone_modules(["zeltimer", "zelblock"], depth=1)
+    assert sorted(cloned) == ["zelblock", "zeltimer"], failed
+    new_head = behind.commit("second")
+    diverged.commit("upstream")
+    local = get_install_dir() / "zelblock"
+    (local / "local.txt").write_text("local")
+    git("add", "-A", cwd=local)
+    git("commit", "-q", "-m", "local", cwd=local)
+
+    plan = {}
+    updated, failed, error = asyncio.run(aio.update_modules(plan=plan))
+
+    assert error is None
+    assert updated == ["zeltimer"]
+    assert failed == [("zelblock", updater.DIVERGED_MESSAGE)]
+    assert plan["zelblock"]["status"] == updater.DIVERGED
+    assert git("rev-parse", "HEAD", cwd=get_install_dir() / "zeltimer") == new_head
+    assert updater.load_ledger()["history"][-1]["to"] == new_head
+
+
+def make_module(root, name, dependencies=()):
+    module_dir = root / name
+    module_dir.mkdir()
+    (module_dir / "pyproject.toml").write_text(
+        f'[project]\nname = "{name}"\ndependencies = {json.dumps(list(dependencies))}\n'
+    )
+    return module_dir
+
+
+def test_build_wheels_skips_dependents_of_failed_builds(tmp_path):
+    pip = tmp_path / "pip"
+    pip.write_text(f"#!{sys.executable}\n{FAKE_PIP}")
+    pip.chmod(0o755)
+    sources = {
+        "base": make_module(tmp_path, "base"),
+        "broken": make_module(tmp_path, "broken"),
+        "app": make_module(tmp_path, "app", ["base"]),
+        "needs-broken": make_module(tmp_path, "needs-broken", ["broken"]),
+    }
+    wheel_dir = tmp_path / "wheels"
+
+    failed = asyncio.run(aio.build_wheels(pip, sources, wheel_dir, jobs=2))
+
+    assert sorted(failed) == ["broken", "needs-broken"]
+    assert sorted(p.name for p in wheel_dir.iterdir()) == [
+        "app-1.0-py3-none-any.whl", "base-1.0-py3-none-any.whl",
+    ]
+
+
+def test_pip_install_reports_stderr_of_failed_components(tmp_path):
+    pip = tmp_path / "pip"
+    pip.write_text(f"#!{sys.executable}\nimport sys\n"
+                   "if sys.argv[-1].endswith('broken'):\n"
+                   "    sys.exit('no matching distribution for broken')\n")
+    pip.chmod(0o755)
+
+    errors = {}
+    failed = asyncio.run(aio.pip_install_editable(pip, ["good", "broken"], tmp_path,
+                                                  errors=errors))
+
+    assert failed == ["broken"]
+    assert list(errors) == ["broken"]
+    assert "no matching distribution" in errors["broken"]
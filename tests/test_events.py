@@ -0,0 +1,38 @@
+import asyncio
+import json
+import threading
+
+from zelutil.core.events import span, tracing
+
+
+def test_concurrent_tasks_get_their_own_track(tmp_path):
+    async def step(module):
+        with span("git fetch", module):
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(*(step(f"zel{i}") for i in range(3)))
+
+    with tracing(tmp_path / "trace.json"):
+        asyncio.run(main())
+
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    assert len({event["tid"] for event in events}) == 3
+
+
+def test_threads_get_their_own_track(tmp_path):
+    barrier = threading.Barrier(2)
+
+    def step(module):
+        with span("pip install", module):
+            barrier.wait()
+
+    with tracing(tmp_path / "trace.json"):
+        threads = [threading.Thread(target=step, args=(m,)) for m in ("a", "b")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    assert len({event["tid"] for event in events}) == 2
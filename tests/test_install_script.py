@@ -0,0 +1,28 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import zelutil.utils.install as install
+from zelutil.utils import build_plan, venv_template
+
+SCRIPT = Path(install.__file__)
+
+
+def test_helpers_come_from_the_package():
+    assert install.load_helper("build_plan") is build_plan
+    assert install.load_helper("venv_template") is venv_template
+
+
+def test_helpers_load_when_run_as_script(tmp_path):
+    # Mimic ``python install.py``: the script's directory is on sys.path
+    # and the module has no package
+    code = "\n".join([
+        "import runpy, sys",
+        f"sys.path.insert(0, {str(SCRIPT.parent)!r})",
+        f"helper = runpy.run_path({str(SCRIPT)!r})['load_helper']('build_plan')",
+        "print(helper.__name__)",
+    ])
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            cwd=tmp_path)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "build_plan"
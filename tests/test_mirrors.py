@@ -0,0 +1,29 @@
+from zelutil.core.installer import clone_module, get_install_dir
+from zelutil.core.mirrors import ensure_mirror, get_mirror_path
+
+from conftest import git
+
+
+def test_mirror_keeps_refs_and_objects_after_force_push(upstream):
+    repo = upstream("zeltimer")
+    old_head = repo.commit("second")
+    ok, message = clone_module("zeltimer", repo.url, shared=True)
+    assert ok, message
+    install_dir = get_install_dir()
+    mirror = get_mirror_path(install_dir, "zeltimer")
+
+    git("checkout", "-q", "-b", "topic", cwd=repo.work)
+    git("push", "-q", "origin", "topic", cwd=repo.work)
+    assert ensure_mirror(install_dir, "zeltimer", repo.url)[0]
+    git("push", "-q", "origin", "--delete", "topic", cwd=repo.work)
+    git("checkout", "-q", "main", cwd=repo.work)
+    git("reset", "-q", "--hard", "HEAD~1", cwd=repo.work)
+    git("push", "-q", "--force", "origin", "main", cwd=repo.work)
+
+    ok, message = ensure_mirror(install_dir, "zeltimer", repo.url)
+    assert ok, message
+
+    assert git("config", "gc.auto", cwd=mirror) == "0"
+    assert git("config", "gc.pruneExpire", cwd=mirror) == "never"
+    assert "topic" in git("branch", "--list", cwd=mirror)
+    assert git("cat-file", "-t", old_head, cwd=install_dir / "zeltimer") == "commit"
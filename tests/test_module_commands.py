@@ -0,0 +1,40 @@
+from click.testing import CliRunner
+
+from zelutil.commands import module_commands
+from zelutil.commands.module_commands import module
+from zelutil.core.fingerprint import record_installed
+from zelutil.core.installer import clone_modules, get_install_dir
+
+
+def test_install_exits_nonzero_when_pip_fails(home, monkeypatch):
+    monkeypatch.setattr(module_commands, "install_modules", lambda *args, **kwargs: False)
+
+    result = CliRunner().invoke(module, ["install", "--no-wheelhouse"])
+
+    assert result.exit_code == 1
+    assert "Installation failed" in result.output
+
+
+def test_update_retries_a_failed_reinstall(upstream, monkeypatch):
+    repo = upstream("zeltimer")
+    cloned, _, failed = clone_modules(["zeltimer"])
+    assert cloned == ["zeltimer"], failed
+    record_installed(["zeltimer"], get_install_dir())
+    (repo.work / "pyproject.toml").write_text('[project]\nname = "zeltimer"\n')
+    repo.commit("build")
+
+    attempts = []
+
+    def install(modules, **kwargs):
+        attempts.append(list(modules))
+        return len(attempts) > 1
+
+    monkeypatch.setattr(module_commands, "install_modules", install)
+
+    first = CliRunner().invoke(module, ["update"])
+    assert first.exit_code == 1
+    assert "Reinstalling changed modules failed" in first.output
+
+    second = CliRunner().invoke(module, ["update"])
+    assert second.exit_code == 0, second.output
+    assert attempts == [["zeltimer"], ["zeltimer"]]
@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from zelutil.core.registry import compile_registry, load_modules
+
+
+@pytest.fixture
+def overlay(home):
+    overlay_dir = home / ".local" / "state" / "zel" / "modules.d"
+    overlay_dir.mkdir(parents=True)
+
+    def write(name, data):
+        (overlay_dir / name).write_text(json.dumps(data))
+        load_modules.cache_clear()
+
+    return write
+
+
+@pytest.mark.parametrize("data", [
+    {"modules": ["zelfoo"]},
+    {"modules": "zelfoo"},
+    ["zelfoo"],
+    None,
+])
+def test_malformed_overlay_is_ignored(overlay, capsys, data):
+    bundled, _ = compile_registry()
+    overlay("bad.json", data)
+    overlay("good.json", {"modules": {"zelfoo": {"name": "zelfoo"}}})
+
+    modules = load_modules()
+    assert modules == {**bundled, "zelfoo": {"name": "zelfoo"}}
+    assert "bad.json" in capsys.readouterr().err
+
+
+def test_malformed_entries_are_skipped(overlay, capsys):
+    overlay("mixed.json", {"modules": {"zelbar": "oops", "zelfoo": {"name": "zelfoo"}}})
+
+    modules = load_modules()
+    assert modules["zelfoo"] == {"name": "zelfoo"}
+    assert "zelbar" not in modules
+    assert "zelbar" in capsys.readouterr().err
@@ -0,0 +1,51 @@
+import json
+import socket
+import threading
+
+import pytest
+
+from zelutil.core import registry, server
+from zelutil.utils import daemon
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+
+
+@pytest.fixture
+def running(home, monkeypatch):
+    """Serve from a background thread for the rest of the test"""
+    monkeypatch.setattr(server, "_registry", None)
+    ready = threading.Event()
+    thread = threading.Thread(target=server.serve, kwargs={"on_ready": lambda _: ready.set()},
+                              daemon=True)
+    thread.start()
+    assert ready.wait(5)
+    # serve() switches the client off for its own process; here it is the client too
+    monkeypatch.setattr(daemon, "_disabled", False)
+    yield
+    daemon.get_socket_path().unlink(missing_ok=True)
+
+
+def test_load_modules_uses_daemon_copy_until_sources_change(running, home, monkeypatch):
+    compiled = []
+    compile_registry = registry.compile_registry
+    monkeypatch.setattr(registry, "compile_registry",
+                        lambda: compiled.append(1) or compile_registry())
+    answered = []
+    request = daemon.request
+    monkeypatch.setattr(daemon, "request",
+                        lambda op, **args: answered.append(op) or request(op, **args))
+
+    first = registry.load_modules()
+    registry.load_modules.cache_clear()
+    assert registry.load_modules() == first
+    assert compiled == [1]
+
+    overlay_dir = home / ".local" / "state" / "zel" / "modules.d"
+    overlay_dir.mkdir(parents=True, exist_ok=True)
+    (overlay_dir / "extra.json").write_text(json.dumps({"modules": {"zelextra": {}}}))
+    registry.load_modules.cache_clear()
+
+    assert "zelextra" in registry.load_modules()
+    assert compiled == [1, 1]
+    assert answered == ["modules"] * 3
+    assert not (home / ".local" / "state" / "zel" / "modules-index.json").exists()
@@ -0,0 +1,24 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import zelutil
+from zelutil.bench import STARTUP_BENCHMARKS
+
+# Modules `zelutil --help` must leave unloaded to keep startup fast
+FORBIDDEN = ["subprocess", "zelutil.core.installer"]
+
+
+def test_help_does_not_import_heavy_modules(home):
+    code = STARTUP_BENCHMARKS["zelutil --help"][0]
+    script = f"{code}\nimport sys\nprint('@@', *[m for m in {FORBIDDEN!r} if m in sys.modules])\n"
+    src = str(Path(zelutil.__file__).parent.parent)
+    pythonpath = os.pathsep.join(filter(None, [src, os.environ.get("PYTHONPATH")]))
+    env = dict(os.environ, PYTHONPATH=pythonpath)
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, env=env)
+
+    assert result.returncode == 0, result.stderr
+    assert "Usage:" in result.stdout
+    loaded = result.stdout[result.stdout.rindex("@@"):].split()[1:]
+    assert loaded == []
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from zelutil.core.manifest import load_manifest, update_manifest
+from zelutil.core.updater import load_ledger, record_plan
+from zelutil.utils.config import load_config, save_config
+from zelutil.utils.state import read_state_file, resolve_state_file, state_transaction
+
+
+def corrupt(name):
+    path = resolve_state_file(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("{bad")
+    return path
+
+
+def test_save_config_replaces_corrupt_file(home):
+    corrupt("config")
+    save_config({"a": 1})
+    assert load_config() == {"a": 1}
+
+
+def test_read_state_file_raises_unless_lenient(home):
+    path = corrupt("paths")
+    with pytest.raises(json.JSONDecodeError):
+        read_state_file(path, {})
+    assert read_state_file(path, {}, strict=False) == {}
+
+
+@pytest.mark.parametrize("data", ["{bad", "[1, 2]"])
+def test_transaction_replaces_unreadable_file(home, data):
+    path = corrupt("paths")
+    path.write_text(data)
+    with state_transaction("paths") as paths:
+        assert paths == {}
+        paths["vault"] = "/vault"
+    assert json.loads(path.read_text()) == {"vault": "/vault"}
+
+
+def test_bookkeeping_recovers_from_corrupt_files(home, tmp_path):
+    corrupt("installed")
+    corrupt("update-ledger")
+    assert load_manifest() == {}
+    assert load_ledger() == {}
+
+    (tmp_path / "zeltimer").mkdir()
+    update_manifest(["zeltimer"], tmp_path)
+    record_plan({"zeltimer": {"status": "current", "from": "a", "to": "a"}})
+
+    assert "zeltimer" in load_manifest()
+    assert "zeltimer" in load_ledger()["modules"]
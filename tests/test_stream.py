@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from zelutil.utils.archive import ItemLog
+from zelutil.utils.stream import iter_items, iter_json_items
+from zelutil.utils.state import resolve_state_dir
+
+DOCUMENTS = [
+    [1.5e3, 1.2345678, -0.25, 12345678901234567890, 1e-7, 0, 10],
+    {"version": 1.2345678, "items": [{"n": 1.5e3, "ok": True, "gone": None}, 2.75]},
+    {"items": [{"id": 1, "flag": False}, {"id": 22, "score": 3.14159}], "count": 2},
+]
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+@pytest.mark.parametrize("chunk_size", range(1, 12))
+def test_scalars_split_across_chunks(tmp_path, document, chunk_size):
+    path = tmp_path / "items.json"
+    for separators in [(",", ":"), (", ", ": ")]:
+        path.write_text(json.dumps(document, separators=separators))
+        expected = document if isinstance(document, list) else document["items"]
+        assert list(iter_json_items(path, chunk_size=chunk_size)) == expected
+
+
+def test_number_at_end_of_file(tmp_path):
+    path = tmp_path / "items.json"
+    path.write_text("[1.25e3]")
+    for chunk_size in range(1, 9):
+        assert list(iter_json_items(path, chunk_size=chunk_size)) == [1.25e3]
+
+
+def write_log(home, days):
+    log = ItemLog("app", path=resolve_state_dir() / "app" / "completed.jsonl")
+    log.append_many([{"id": i, "date": day} for i, day in enumerate(days)])
+    return log
+
+
+def test_offset_of_day_skips_earlier_lines(home):
+    days = [f"2026-01-{d:02d}" for d in range(1, 29) for _ in range(3)]
+    log = write_log(home, days)
+
+    for day in ["2025-12-31", "2026-01-01", "2026-01-10", "2026-01-28", "2026-02-01"]:
+        start = log.offset_of_day(day)
+        assert [item["date"] for item in log.items(start)] == [d for d in days if d >= day]
+
+
+def test_ordered_since_matches_full_scan(home):
+    days = [f"2026-03-{d:02d}" for d in range(1, 31, 2)]
+    write_log(home, days)
+    with open(resolve_state_dir() / "app" / "completed.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"id": "undated"}\n{"id": "torn", "date": "2026-03-3')
+
+    for since, until in [("2026-03-08", "2026-03-20"), ("2026-03-01", None), ("2026-04-01", None)]:
+        ordered = list(iter_items("app", since=since, until=until, ordered=True))
+        scanned = list(iter_items("app", since=since, until=until))
+        assert ordered == scanned
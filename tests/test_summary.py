@@ -0,0 +1,43 @@
+import json
+
+from zelutil.core.summary import get_index_dir, summarize
+from zelutil.utils.archive import ItemLog
+from zelutil.utils.state import resolve_state_dir
+from zelutil.utils.storage import AppStorage
+
+
+def items(day, *titles):
+    return [{"id": f"{day}-{t}", "title": t, "date": day} for t in titles]
+
+
+def test_index_keeps_counts_and_labels_are_read_on_request(home):
+    log = ItemLog("zeltimer", "completed")
+    log.append_many(items("2026-05-01", "a", "b") + items("2026-05-02", "c"))
+    app_dir = resolve_state_dir() / "zelblock"
+    app_dir.mkdir(parents=True)
+    (app_dir / "active.json").write_text(json.dumps(items("2026-05-02", "d")))
+
+    assert summarize("2026-05-02", "2026-05-02") == {
+        "2026-05-02": {"zelblock": {"active": {"count": 1}},
+                       "zeltimer": {"completed": {"count": 1}}},
+    }
+    index = (get_index_dir() / "zeltimer.json").read_text()
+    assert '"title"' not in index and '"c"' not in index
+
+    log.append_many(items("2026-05-02", "e"))
+    assert summarize("2026-05-01", "2026-05-02", labels=True) == {
+        "2026-05-01": {"zeltimer": {"completed": {"count": 2, "labels": ["a", "b"]}}},
+        "2026-05-02": {"zelblock": {"active": {"count": 1, "labels": ["d"]}},
+                       "zeltimer": {"completed": {"count": 2, "labels": ["c", "e"]}}},
+    }
+
+
+def test_storage_apps_count_from_the_day_index(home):
+    with AppStorage("zelbudget") as storage:
+        storage.put_many("completed", items("2026-05-01", "x", "y") + items("2026-05-03", "z"))
+
+    assert summarize("2026-05-01", "2026-05-02", apps=["zelbudget"]) == {
+        "2026-05-01": {"zelbudget": {"completed": {"count": 2}}},
+    }
+    result = summarize("2026-05-03", "2026-05-03", apps=["zelbudget"], labels=True)
+    assert result["2026-05-03"]["zelbudget"]["completed"] == {"count": 1, "labels": ["z"]}
@@ -0,0 +1,48 @@
+from zelutil.core import updater
+from zelutil.core.installer import clone_module, clone_modules, get_install_dir
+
+from conftest import git
+
+
+def test_fetch_keeps_shallow_clone_shallow(upstream):
+    repo = upstream("zeltimer")
+    repo.commit("second")
+    ok, message = clone_module("zeltimer", repo.url, depth=1)
+    assert ok, message
+    module_dir = get_install_dir() / "zeltimer"
+    repo.commit("third")
+
+    returncode, stderr, _ = updater.fetch_module(module_dir, {"depth": 1})
+
+    assert returncode == 0, stderr
+    assert git("rev-parse", "--is-shallow-repository", cwd=module_dir) == "true"
+    assert git("rev-list", "--count", "@{upstream}", cwd=module_dir) == "2"
+
+
+def test_shallow_clone_is_behind_after_upstream_commit(upstream):
+    repo = upstream("zeltimer")
+    ok, message = clone_module("zeltimer", repo.url, depth=1)
+    assert ok, message
+    module_dir = get_install_dir() / "zeltimer"
+    new_head = repo.commit("second")
+
+    returncode, stderr, _ = updater.fetch_module(module_dir, {"depth": 1})
+    assert returncode == 0, stderr
+    status, _, target = updater.compare_upstream(module_dir)
+
+    assert status == updater.BEHIND
+    assert target == new_head
+
+
+def test_update_fast_forwards_module_cloned_with_depth(upstream):
+    repo = upstream("zeltimer")
+    cloned, _, failed = clone_modules(["zeltimer"], depth=1)
+    assert cloned == ["zeltimer"], failed
+    new_head = repo.commit("second")
+
+    updated, failed, error = updater.update_modules()
+
+    assert error is None
+    assert failed == []
+    assert updated == ["zeltimer"]
+    assert git("rev-parse", "HEAD", cwd=get_install_dir() / "zeltimer") == new_head